@@ -53,10 +53,10 @@ class ConfigManager:
         with open(self.config_path, 'w') as config_file:
             self.config_parse.write(config_file)
 
-        self.logger.debug(f"File '{self.config_path}' overwritten")
+        self.logger.debug("File '%s' overwritten", self.config_path)
 
     async def configure(self, remove_session=False):
-        self.logger.debug(f"Authorization form called ({remove_session=})")
+        self.logger.debug("Authorization form called (remove_session=%r)", remove_session)
 
         if remove_session:
             self.remove_session()
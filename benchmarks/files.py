@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import tempfile
+import time
+
+import aiofiles
+
+from utils import Utils
+
+
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="benchmark")
+
+
+async def aiofiles_read(path: str) -> bytes:
+    async with aiofiles.open(path, 'rb') as file:
+        return await file.read()
+
+
+async def aiofiles_write(path: str, content: bytes) -> int:
+    async with aiofiles.open(path, 'wb') as file:
+        return await file.write(content)
+
+
+async def sync_read(path: str) -> bytes:
+    return Utils.Files.read_sync(path, 'rb')
+
+
+async def sync_write(path: str, content: bytes) -> int:
+    return Utils.Files.write_sync(path, content, 'wb')
+
+
+async def thread_read(path: str) -> bytes:
+    return await asyncio.to_thread(Utils.Files.read_sync, path, 'rb')
+
+
+async def thread_write(path: str, content: bytes) -> int:
+    return await asyncio.to_thread(Utils.Files.write_sync, path, content, 'wb')
+
+
+async def executor_read(path: str) -> bytes:
+    return await asyncio.get_running_loop().run_in_executor(executor, Utils.Files.read_sync, path, 'rb')
+
+
+async def executor_write(path: str, content: bytes) -> int:
+    return await asyncio.get_running_loop().run_in_executor(executor, Utils.Files.write_sync, path, content, 'wb')
+
+
+async def adaptive_read(path: str) -> bytes:
+    return await Utils.Files.read_file(path)
+
+
+async def adaptive_write(path: str, content: bytes) -> int:
+    return await Utils.Files.save_content_to_file(content, path)
+
+
+strategies: dict = {
+    "aiofiles": (aiofiles_read, aiofiles_write),
+    "sync": (sync_read, sync_write),
+    "to_thread": (thread_read, thread_write),
+    "executor": (executor_read, executor_write),
+    "adaptive": (adaptive_read, adaptive_write)
+}
+
+
+async def measure(operation, args: tuple, operations: int) -> tuple:
+    stall: float = 0.0
+    running: bool = True
+
+    async def ticker():
+        nonlocal stall
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    for _ in range(operations):
+        await operation(*args)
+    elapsed = time.perf_counter() - started
+
+    running = False
+    await task
+    return operations / elapsed, stall * 1000
+
+
+async def run(sizes: list, operations: int) -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{'size':>10} {'strategy':<10} {'read ops/s':>12} {'stall ms':>9} {'write ops/s':>12} {'stall ms':>9}")
+
+        for size in sizes:
+            path = os.path.join(folder, f"file-{size}")
+            content = os.urandom(size)
+            Utils.Files.write_sync(path, content, 'wb')
+            count = max(10, operations * 1024 // max(size, 1024))
+
+            for name, (read, write) in strategies.items():
+                read_rate, read_stall = await measure(read, (path,), count)
+                write_rate, write_stall = await measure(write, (path, content), count)
+                print(f"{size:>10} {name:<10} {read_rate:>12,.0f} {read_stall:>9.2f} {write_rate:>12,.0f} {write_stall:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Utils.Files I/O path benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 4096, 65536, 262144, 1048576, 8388608], help="File sizes in bytes")
+    parser.add_argument("--operations", type=int, default=2000, help="Operations per strategy for 1 KiB files, scaled down for larger sizes")
+    args = parser.parse_args()
+
+    print(f"inline limit: {Utils.Files.io_inline_limit} bytes")
+    asyncio.run(run(args.sizes, args.operations))
+
+
+if __name__ == "__main__":
+    main()
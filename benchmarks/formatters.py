@@ -0,0 +1,62 @@
+import argparse
+import inspect
+import logging
+import time
+
+from logger import Moon
+
+
+def make_record(message: str = "Module 'hayes' Hooked.") -> logging.LogRecord:
+    return logging.LogRecord(
+        name="benchmark",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg=message,
+        args=None,
+        exc_info=None
+    )
+
+
+def measure(formatter: logging.Formatter, records: int, repeat: int) -> float:
+    record = make_record()
+    best: float = float("inf")
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(records):
+            record.created += 0.0001
+            formatter.format(record)
+        best = min(best, time.perf_counter() - started)
+
+    return records / best
+
+
+def formatters() -> dict:
+    result: dict = {
+        "stdlib logging.Formatter": logging.Formatter(),
+        "stdlib Moon default": logging.Formatter("[{name}] [{asctime}] - [{levelname}]: {message}", style='{')
+    }
+
+    for name, preset in inspect.getmembers(Moon.Presets, inspect.isclass):
+        if issubclass(preset, logging.Formatter) and preset is not getattr(Moon.Presets, "Base", None):
+            result[name] = preset()
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Moon formatter benchmark.")
+    parser.add_argument("--records", type=int, default=20000, help="Records formatted per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per formatter, best is reported")
+    args = parser.parse_args()
+
+    results = {name: measure(formatter, args.records, args.repeat) for name, formatter in formatters().items()}
+    baseline = results["stdlib logging.Formatter"]
+
+    for name, rate in sorted(results.items(), key=lambda item: item[1], reverse=True):
+        print(f"{name:<28} {rate:>12,.0f} records/s  {rate / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+from telethon.sessions import MemorySession, SQLiteSession
+from telethon.tl import types
+
+from session import HayesSession
+
+
+def make_result(index: int, users: int) -> types.contacts.ResolvedPeer:
+    return types.contacts.ResolvedPeer(
+        peer=types.PeerUser(index % users + 1),
+        users=[
+            types.User(
+                id=(index + offset) % users + 1,
+                access_hash=((index + offset) % users + 1) * 7919,
+                username=f"user{(index + offset) % users + 1}",
+                first_name=f"User {(index + offset) % users + 1}"
+            )
+            for offset in range(2)
+        ],
+        chats=[
+            types.Channel(
+                id=index % 50 + 1,
+                title=f"Channel {index % 50 + 1}",
+                photo=types.ChatPhotoEmpty(),
+                date=datetime.datetime.now(tz=datetime.timezone.utc),
+                access_hash=(index % 50 + 1) * 104729
+            )
+        ]
+    )
+
+
+def measure(session, messages: int, users: int, save_every: int) -> float:
+    results = [make_result(index, users) for index in range(messages)]
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+
+    started = time.perf_counter()
+    for index, result in enumerate(results):
+        session.process_entities(result)
+        session.get_input_entity(index % users + 1)
+        session.set_update_state(0, types.updates.State(pts=index, qts=0, date=now, seq=index, unread_count=0))
+
+        if save_every and index % save_every == 0:
+            session.save()
+
+    session.save()
+    elapsed = time.perf_counter() - started
+    session.close()
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session backend benchmark.")
+    parser.add_argument("--messages", type=int, default=20000, help="Messages processed per backend")
+    parser.add_argument("--users", type=int, default=2000, help="Distinct users seen in the message stream")
+    parser.add_argument("--save-every", type=int, default=1000, help="Call session.save() every N messages, 0 to save only at the end")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        backends: dict = {
+            "MemorySession": lambda: MemorySession(),
+            "SQLiteSession": lambda: SQLiteSession(os.path.join(folder, "sqlite")),
+            "HayesSession": lambda: HayesSession(os.path.join(folder, "hayes"))
+        }
+
+        results = {}
+        for name, factory in backends.items():
+            session = factory()
+            session.process_entities(types.contacts.ResolvedPeer(
+                peer=types.PeerUser(1),
+                users=[types.User(id=index, access_hash=index * 7919) for index in range(1, args.users + 1)],
+                chats=[]
+            ))
+            results[name] = measure(session, args.messages, args.users, args.save_every)
+
+        baseline = results["SQLiteSession"]
+        for name, rate in results.items():
+            print(f"{name:<16} {rate:>12,.0f} messages/s  {rate / baseline:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
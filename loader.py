@@ -1,5 +1,9 @@
 from logger import Moon, LogLevel
 from utils import Utils
+from supervisor import Channel
+from session import HayesSession, CachedSession, EntityCache, UploadCache
+from store import BlobStore
+from transfer import Transfer
 
 from typing import Any
 from telethon import TelegramClient, events, Button
@@ -15,11 +19,458 @@ import subprocess
 import re
 import inspect
 import py_compile
-import ast
 import functools
 import types
 import aiofiles
 import aiohttp
+import asyncio
+import time
+import contextvars
+
+
+class Metrics:
+    latency_buckets: tuple = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    sample_interval: float = 0.5
+    registry: dict = {}
+    collectors: list = []
+
+    class Metric:
+        kind: str = "untyped"
+
+        def __init__(self, name: str, description: str):
+            self.name = name
+            self.description = description
+            self.values: dict = {}
+
+        @staticmethod
+        def key(labels: dict) -> tuple:
+            return tuple(sorted(labels.items()))
+
+        @staticmethod
+        def escape(value) -> str:
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        @classmethod
+        def format_labels(cls, key: tuple, extra: tuple = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ''
+
+            return '{' + ','.join(f'{name}="{cls.escape(value)}"' for name, value in pairs) + '}'
+
+        def total(self) -> float:
+            return sum(self.values.values())
+
+        def render(self) -> list:
+            return [f"{self.name}{self.format_labels(key)} {value}" for key, value in self.values.items()]
+
+    class Counter(Metric):
+        kind: str = "counter"
+
+        def inc(self, amount: float = 1, **labels) -> None:
+            key = self.key(labels)
+            self.values[key] = self.values.get(key, 0) + amount
+
+    class Gauge(Metric):
+        kind: str = "gauge"
+
+        def set(self, value: float, **labels) -> None:
+            self.values[self.key(labels)] = value
+
+    class Histogram(Metric):
+        kind: str = "histogram"
+
+        def __init__(self, name: str, description: str, buckets: tuple):
+            super().__init__(name, description)
+            self.buckets = buckets
+
+        def observe(self, value: float, **labels) -> None:
+            key = self.key(labels)
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+
+            entry[1] += value
+            entry[2] += 1
+
+        def total(self) -> float:
+            return sum(entry[2] for entry in self.values.values())
+
+        def render(self) -> list:
+            lines = []
+            for key, (counts, total, count) in self.values.items():
+                for bound, bucket in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{self.format_labels(key, (('le', bound),))} {bucket}")
+
+                lines.append(f"{self.name}_bucket{self.format_labels(key, (('le', '+Inf'),))} {count}")
+                lines.append(f"{self.name}_sum{self.format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{self.format_labels(key)} {count}")
+
+            return lines
+
+    @classmethod
+    def register(cls, metric: "Metrics.Metric") -> "Metrics.Metric":
+        return cls.registry.setdefault(metric.name, metric)
+
+    @classmethod
+    def counter(cls, name: str, description: str) -> "Metrics.Counter":
+        return cls.register(cls.Counter(name, description))
+
+    @classmethod
+    def gauge(cls, name: str, description: str) -> "Metrics.Gauge":
+        return cls.register(cls.Gauge(name, description))
+
+    @classmethod
+    def histogram(cls, name: str, description: str, buckets: tuple | None = None) -> "Metrics.Histogram":
+        return cls.register(cls.Histogram(name, description, buckets or cls.latency_buckets))
+
+    @classmethod
+    def collect(cls) -> None:
+        for collector in cls.collectors:
+            try:
+                collector()
+            except Exception as e:
+                Loader.moon.error("Metrics collector %s failed: %s", getattr(collector, '__qualname__', collector), e)
+
+    @classmethod
+    def render(cls) -> str:
+        cls.collect()
+        lines = []
+
+        for metric in cls.registry.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def write(path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = f"{path}.tmp"
+
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+
+        os.replace(temp_path, path)
+
+    @classmethod
+    async def watch(cls) -> None:
+        loop = asyncio.get_running_loop()
+        written = loop.time()
+
+        while True:
+            expected = loop.time() + cls.sample_interval
+            await asyncio.sleep(cls.sample_interval)
+            lag = max(0.0, loop.time() - expected)
+            cls.loop_lag.set(lag)
+            cls.loop_lag_samples.observe(lag)
+
+            interval = Utils.Config.metrics_interval
+            if not Utils.Config.metrics_file or not interval or loop.time() - written < interval:
+                continue
+
+            written = loop.time()
+            try:
+                await asyncio.to_thread(cls.write, Utils.Config.metrics_file, cls.render())
+            except OSError as e:
+                Loader.moon.error("Failed to write metrics to '%s': %s", Utils.Config.metrics_file, e)
+
+
+Metrics.updates = Metrics.counter("hayes_updates_total", "Updates received from Telegram")
+Metrics.commands = Metrics.counter("hayes_commands_total", "Commands dispatched")
+Metrics.handler_seconds = Metrics.histogram("hayes_handler_seconds", "Handler latency in seconds")
+Metrics.api_calls = Metrics.counter("hayes_api_calls_total", "Outbound API requests")
+Metrics.flood_wait = Metrics.counter("hayes_flood_wait_seconds_total", "Seconds of FloodWait received")
+Metrics.reconnects = Metrics.counter("hayes_reconnects_total", "Automatic reconnects")
+Metrics.log_queue = Metrics.gauge("hayes_log_queue_depth", "Records waiting in the log writer queue")
+Metrics.inflight = Metrics.gauge("hayes_inflight_handlers", "Handlers currently running")
+Metrics.uptime = Metrics.gauge("hayes_uptime_seconds", "Seconds since start")
+Metrics.loop_lag = Metrics.gauge("hayes_event_loop_lag_seconds", "Last measured event loop lag")
+Metrics.loop_lag_samples = Metrics.histogram("hayes_event_loop_lag_sample_seconds", "Event loop lag samples", (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+Metrics.entity_cache = Metrics.gauge("hayes_entity_cache", "Entity cache size, hits and misses")
+Metrics.upload_cache = Metrics.gauge("hayes_upload_cache", "Upload cache size, hits and misses")
+
+
+class Client(TelegramClient):
+    class FloodLedger(dict):
+        def __init__(self, label: str):
+            super().__init__()
+            self.label = label
+
+        def __setitem__(self, key, due) -> None:
+            Metrics.flood_wait.inc(max(0.0, due - time.time()), account=self.label)
+            super().__setitem__(key, due)
+
+    def __init__(self, *args, label: str = "main", **kwargs):
+        super().__init__(*args, **kwargs)
+        self.label = label
+        self._flood_waited_requests = Client.FloodLedger(label)
+
+    async def _call(self, sender, request, ordered=False, flood_sleep_threshold=None):
+        for item in (request if telethon.utils.is_list_like(request) else (request,)):
+            Metrics.api_calls.inc(account=self.label, method=type(item).__name__)
+
+        return await super()._call(sender, request, ordered, flood_sleep_threshold)
+
+    async def _handle_auto_reconnect(self):
+        Metrics.reconnects.inc(account=self.label)
+        return await super()._handle_auto_reconnect()
+
+
+class Account:
+    primary_name: str = "main"
+    current: contextvars.ContextVar = contextvars.ContextVar("account")
+    me_updates: tuple = (
+        telethon.types.UpdateUser, telethon.types.UpdateUserName,
+        telethon.types.UpdateUserPhone, telethon.types.UpdateUserEmojiStatus
+    )
+
+    def __init__(self, name: str, settings: dict, primary: bool = False):
+        self.name = name
+        self.primary = primary
+        self.api_token: str = settings.get("api_token", "")
+        self.me = None
+        self.me_hits: int = 0
+        self.me_misses: int = 0
+        self.handlers: dict = {}
+        self.entities: EntityCache = EntityCache(f"{settings['session_name']}.entities", Utils.Config.entity_store_size, Utils.Config.entity_store_ttl)
+        self.uploads: UploadCache = UploadCache(f"{settings['session_name']}.uploads")
+
+        self.moon: Moon = Moon(
+            name=TelegramClient.__name__ if primary else f"{TelegramClient.__name__}.{name}",
+            log_file=Utils.Files.log_path('client.log' if primary else f'client-{name}.log'),
+            disabled=not Utils.Config.ClientActions,
+            stream_handler=False,
+            file_level=LogLevel.INFO
+        )
+
+        self.client = Client(
+            session=Account.session(settings["session_name"]),
+            api_id=settings["api_id"],
+            api_hash=settings["api_hash"],
+            use_ipv6=Utils.Config.ipv6,
+            request_retries=Utils.Config.request_retries,
+            retry_delay=Utils.Config.retry_delay,
+            auto_reconnect=Utils.Config.auto_reconnect,
+            flood_sleep_threshold=Utils.Config.flood_sleep_threshold,
+            device_model=Utils.Config.device_model,
+            system_version=Utils.Config.system_version,
+            app_version=Utils.Config.app_version,
+            lang_code=Utils.Config.lang_code,
+            entity_cache_limit=Utils.Config.entity_cache_limit,
+            base_logger=self.moon.base_logger(),
+            label=name
+        )
+
+        self.inline: TelegramClient | None = Client(
+            session=Account.session(settings["inline_session_name"]),
+            api_id=settings["api_id"],
+            api_hash=settings["api_hash"],
+            label=f"{name}.inline"
+        ) if primary or self.api_token else None
+
+        self.client.session.entity_cache = self.entities
+
+    @staticmethod
+    def session(session_name: str) -> HayesSession | CachedSession:
+        if Utils.Config.session_backend == "wal":
+            return HayesSession(session_name, flush_interval=Utils.Config.session_flush_interval)
+
+        return CachedSession(session_name)
+
+    @staticmethod
+    def settings() -> dict:
+        config = Utils.Config
+        accounts: dict = {
+            Account.primary_name: {
+                "api_id": config.api_id,
+                "api_hash": config.api_hash,
+                "api_token": config.api_token,
+                "admin_id": config.admin_id,
+                "session_name": config.session_name,
+                "inline_session_name": config.inline_session_name
+            }
+        }
+
+        for name, section in config.accounts.items():
+            accounts[name] = {
+                **accounts[Account.primary_name],
+                "api_token": "",
+                "session_name": f"{config.session_name}-{name}",
+                "inline_session_name": f"{config.inline_session_name}-{name}",
+                **section
+            }
+
+        return accounts
+
+    @property
+    def admin_ids(self) -> list:
+        if self.primary:
+            return Utils.Config.admin_ids
+
+        return Utils.Config.split_ids(Utils.Config.accounts.get(self.name, {}).get("admin_id", Utils.Config.admin_id))
+
+    def target(self, attribute: str) -> TelegramClient | None:
+        return getattr(self, attribute)
+
+    def bind(self, attribute: str, callback, event=None) -> None:
+        client = self.target(attribute)
+        if client is None:
+            Loader.moon.warning("Account '%s' has no %s client, '%s' is not bound to it", self.name, attribute, callback.__qualname__)
+            return
+
+        account = self
+
+        async def bound(update):
+            token = Account.current.set(account)
+            try:
+                return await callback(update)
+            finally:
+                Account.current.reset(token)
+
+        self.handlers.setdefault((attribute, callback), []).append(bound)
+        client.add_event_handler(bound, event)
+
+    def unbind(self, attribute: str, callback, event=None) -> int:
+        client = self.target(attribute)
+        if client is None:
+            return 0
+
+        return sum(client.remove_event_handler(bound, event) for bound in self.handlers.pop((attribute, callback), []))
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self.entities.load)
+        await asyncio.to_thread(self.uploads.load)
+        seeded = await asyncio.to_thread(self.entities.seed, self.client)
+        Loader.moon.debug("Account '%s' seeded %d cached entities", self.name, seeded)
+        await self.client.start()
+        self.me = await self.client.get_me()
+        self.entities.put(self.me)
+        self.client.add_event_handler(self.on_me_update, events.Raw(self.me_updates))
+        self.client.add_event_handler(self.on_update, events.Raw)
+
+        if self.inline is not None:
+            await self.inline.connect()
+            await self.inline.sign_in(bot_token=self.api_token)
+            await self.inline.start()
+
+        Loader.moon.info("Account '%s' started as %s", self.name, self.me.id)
+
+    async def run_until_disconnected(self) -> None:
+        await asyncio.gather(*(
+            client.run_until_disconnected()
+            for client in (self.client, self.inline)
+            if client is not None
+        ))
+
+    async def disconnect(self) -> None:
+        for client in (self.client, self.inline):
+            if client is not None:
+                await client.disconnect()
+
+        try:
+            await asyncio.to_thread(self.entities.save)
+        except OSError as e:
+            Loader.moon.error("Entity cache '%s' save failed: %s", self.entities.path, e)
+
+    async def reload(self) -> None:
+        await asyncio.to_thread(self.entities.load)
+        await asyncio.to_thread(self.uploads.load)
+
+        for client in (self.client, self.inline):
+            if client is not None and isinstance(client.session, HayesSession):
+                await asyncio.to_thread(client.session.load)
+
+        await asyncio.to_thread(self.entities.seed, self.client)
+
+        await self.client.catch_up()
+        Loader.moon.debug("Account '%s' reloaded session, entities and uploads", self.name)
+
+    async def on_update(self, update) -> None:
+        Metrics.updates.inc(account=self.name, type=type(update).__name__)
+
+    async def on_me_update(self, update) -> None:
+        if self.me is not None and update.user_id == self.me.id:
+            self.me = None
+
+    async def get_me(self) -> telethon.types.User:
+        if self.me is not None:
+            self.me_hits += 1
+            return self.me
+
+        self.me_misses += 1
+        self.me = await self.client.get_me()
+        self.entities.put(self.me)
+        return self.me
+
+    async def get_entity(self, peer):
+        entity = self.entities.get(peer)
+        if entity is not None:
+            return entity
+
+        entity = await self.client.get_entity(peer)
+        self.entities.put_many(entity if isinstance(entity, list) else [entity])
+        return entity
+
+    async def send_file(self, entity, file_path: str, **kwargs) -> telethon.types.Message:
+        key = await asyncio.to_thread(self.uploads.digest, file_path)
+        document = self.uploads.get(key)
+        message = None
+
+        if document is not None:
+            try:
+                message = await self.client.send_file(entity, document, **kwargs)
+            except (telethon.errors.FileReferenceExpiredError, telethon.errors.MediaEmptyError, telethon.errors.FileIdInvalidError) as e:
+                Loader.moon.debug("Cached upload for '%s' is no longer valid: %s", file_path, e)
+                self.uploads.discard(key)
+
+        if message is None:
+            message = await self.client.send_file(entity, await Transfer.upload(self.client, file_path), **kwargs)
+
+        if self.uploads.put(key, message.media):
+            try:
+                await asyncio.to_thread(self.uploads.save)
+            except OSError as e:
+                Loader.moon.error("Upload cache '%s' save failed: %s", self.uploads.path, e)
+
+        return message
+
+
+class ClientProxy:
+    def __init__(self, attribute: str):
+        object.__setattr__(self, "attribute", attribute)
+
+    def target(self) -> TelegramClient:
+        client = Module.current_account().target(self.attribute)
+        if client is None:
+            client = Module.accounts[0].target(self.attribute)
+
+        return client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.target(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.target(), name, value)
+
+    def add_event_handler(self, callback, event=None) -> None:
+        for account in Module.accounts:
+            account.bind(self.attribute, callback, event)
+
+    def remove_event_handler(self, callback, event=None) -> int:
+        return sum(account.unbind(self.attribute, callback, event) for account in Module.accounts)
+
+    def on(self, event):
+        def decorator(callback):
+            self.add_event_handler(callback, event)
+            return callback
+
+        return decorator
 
 
 class Module:
@@ -30,6 +481,7 @@ class Module:
 
     utils = Utils
     Utils = Utils
+    metrics = Metrics
 
     _name: str = 'Unknown'
     _description: str = 'None'
@@ -44,34 +496,25 @@ class Module:
     CallbackQuery: events.CallbackQuery = events.CallbackQuery
     InlineQuery: events.InlineQuery = events.InlineQuery
 
-    client = TelegramClient(
-        session=Utils.Config.session_name,
-        api_id=Utils.Config.api_id,
-        api_hash=Utils.Config.api_hash,
-        use_ipv6=Utils.Config.ipv6,
-        request_retries=Utils.Config.request_retries,
-        retry_delay=Utils.Config.retry_delay,
-        auto_reconnect=Utils.Config.auto_reconnect,
-        flood_sleep_threshold=Utils.Config.flood_sleep_threshold,
-        device_model=Utils.Config.device_model,
-        system_version=Utils.Config.system_version,
-        app_version=Utils.Config.app_version,
-        lang_code=Utils.Config.lang_code,
-        entity_cache_limit=Utils.Config.entity_cache_limit,
-        base_logger=Moon(
-            name=TelegramClient.__name__,
-            log_file=Utils.Files.log_path('client.log'),
-            disabled=not Utils.Config.ClientActions,
-            stream_handler=False,
-            file_level=LogLevel.INFO
-        ).base_logger()
-    )
+    _loggers: list = []
 
-    inline: TelegramClient = TelegramClient(
-        session=Utils.Config.inline_session_name,
-        api_id=Utils.Config.api_id,
-        api_hash=Utils.Config.api_hash
-    )
+    channel: Channel | None = Channel.from_environ()
+    active: bool = channel is None or not channel.standby
+    draining: bool = False
+    inflight: int = 0
+    drain_timeout: float = 25.0
+
+    accounts: list = [
+        Account(name, settings, primary=name == Account.primary_name)
+        for name, settings in Account.settings().items()
+    ]
+
+    client = ClientProxy("client")
+    inline = ClientProxy("inline")
+
+    @staticmethod
+    def current_account() -> "Account":
+        return Account.current.get(None) or Module.accounts[0]
 
     @classmethod
     def init(cls):
@@ -80,7 +523,27 @@ class Module:
 
     @staticmethod
     async def get_me() -> telethon.types.User | telethon.types.InputPeerUser:
-        return await Module.client.get_me()
+        return await Module.current_account().get_me()
+
+    @staticmethod
+    async def get_entity(peer) -> telethon.types.User | telethon.types.Chat | telethon.types.Channel:
+        return await Module.current_account().get_entity(peer)
+
+    @staticmethod
+    async def send_file(entity, file_path: str, **kwargs) -> telethon.types.Message:
+        return await Module.current_account().send_file(entity, file_path, **kwargs)
+
+    @staticmethod
+    async def download_file(message, file_path: str, progress=None) -> str:
+        return await Transfer.download(Module.current_account().client, message, file_path, progress)
+
+    @staticmethod
+    async def upload_file(file_path: str, progress=None) -> telethon.types.InputFile | telethon.types.InputFileBig:
+        return await Transfer.upload(Module.current_account().client, file_path, progress)
+
+    @staticmethod
+    async def respond_file(event, file_path: str, message: str = '', **kwargs) -> telethon.types.Message:
+        return await Module.send_file(await event.get_input_chat(), file_path, caption=message, **kwargs)
 
     @staticmethod
     async def get_command(event) -> str:
@@ -109,6 +572,10 @@ class Module:
             file_level=LogLevel.DEBUG,
         )
         logger.set_formatter(formatter)
+
+        if logger not in cls._loggers:
+            cls._loggers.append(logger)
+
         return logger
 
     @classmethod
@@ -127,10 +594,10 @@ class Module:
         return cls.req(module_name=f"plugins.{plugin_name}", _importlib=_importlib)
 
     @staticmethod
-    def add_command(cls, command: str, description: str = 'None', handler=None) -> None:
+    def add_command(cls, command: str, description: str = 'None', handler=None, callback=None) -> None:
         if cls._name not in cls._commands:
             cls._commands[cls._name] = []
-        cls._commands[cls._name].append({"command": f".{command}", "description": description, "handler": handler})
+        cls._commands[cls._name].append({"command": f".{command}", "description": description, "handler": handler, "callback": callback})
 
     @classmethod
     def remove_commands(cls, module_name: str) -> None:
@@ -216,14 +683,114 @@ class Module:
 
     @staticmethod
     def restart() -> None:
+        if Module.channel is not None:
+            Module.channel.send("restart")
+            return
+
         subprocess.Popen([sys.executable, sys.argv[0]])
         sys.exit()
 
     @staticmethod
-    def exit() -> None:
-        Module.client.disconnect()
+    async def disconnect() -> None:
+        for account in Module.accounts:
+            await account.disconnect()
+
+    @staticmethod
+    async def activate() -> None:
+        for account in Module.accounts:
+            await account.reload()
+
+        Module.active = True
+
+    @staticmethod
+    async def exit() -> None:
+        if Module.channel is not None:
+            Module.channel.send("exit")
+
+        await Module.disconnect()
         sys.exit()
 
+    @staticmethod
+    def accepting() -> bool:
+        return Module.active and not Module.draining
+
+    @staticmethod
+    async def track(coroutine, command: str | None = None) -> Any:
+        handler = f"{coroutine.__qualname__.split('.')[0]}.{coroutine.__name__}"
+        status = "ok"
+        started = time.perf_counter()
+        Module.inflight += 1
+
+        try:
+            return await coroutine
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            Module.inflight -= 1
+            Metrics.handler_seconds.observe(time.perf_counter() - started, handler=handler)
+            if command is not None:
+                Metrics.commands.inc(command=command, status=status)
+
+    @staticmethod
+    def collect_metrics() -> None:
+        Metrics.log_queue.set(Moon.writer.depth())
+        Metrics.inflight.set(Module.inflight)
+        Metrics.uptime.set(round((datetime.now() - Module._start_time).total_seconds(), 3))
+
+        for account in Module.accounts:
+            for name, value in account.entities.stats().items():
+                Metrics.entity_cache.set(value, account=account.name, stat=name)
+            for name, value in account.uploads.stats().items():
+                Metrics.upload_cache.set(value, account=account.name, stat=name)
+
+    @staticmethod
+    async def drain() -> None:
+        Module.draining = True
+        started = time.monotonic()
+
+        while Module.inflight and time.monotonic() - started < Module.drain_timeout:
+            await asyncio.sleep(0.1)
+
+        Loader.moon.info("Drained after %.1fs with %d handlers still running", time.monotonic() - started, Module.inflight)
+        await Module.disconnect()
+
+    @staticmethod
+    def apply_config(changes: dict) -> None:
+        config = Utils.Config
+
+        if "ModuleActions" in changes:
+            for logger in Module._loggers:
+                logger.base_logger().disabled = not config.ModuleActions
+
+        if "LoaderActions" in changes:
+            Loader.moon.base_logger().disabled = not config.LoaderActions
+
+        for account in Module.accounts:
+            if "ClientActions" in changes:
+                account.moon.base_logger().disabled = not config.ClientActions
+
+            if "flood_sleep_threshold" in changes:
+                account.client.flood_sleep_threshold = config.flood_sleep_threshold
+            if "request_retries" in changes:
+                account.client._request_retries = config.request_retries
+            if "retry_delay" in changes:
+                account.client._retry_delay = config.retry_delay
+            if "auto_reconnect" in changes:
+                account.client._auto_reconnect = config.auto_reconnect
+            if "entity_cache_limit" in changes:
+                account.client._entity_cache_limit = config.entity_cache_limit
+            if "entity_store_size" in changes:
+                account.entities.size = config.entity_store_size
+            if "entity_store_ttl" in changes:
+                account.entities.max_age = config.entity_store_ttl
+            if "session_flush_interval" in changes:
+                for client in (account.client, account.inline):
+                    if client is not None and isinstance(client.session, HayesSession):
+                        client.session.flush_interval = config.session_flush_interval
+
+        Loader.moon.info("Applied config changes: %s", {key: new for key, (old, new) in changes.items() if key not in ("api_hash", "api_token")})
+
     @staticmethod
     def uptime() -> str:
         return str(datetime.now() - Module._start_time)
@@ -234,20 +801,23 @@ class Module:
             if pattern:
                 if event.raw_text and re.match(pattern, event.raw_text):
                     sender_id = event.sender.id if event.sender else event.from_id.user_id
-                    if str(sender_id) not in Utils.Config.admin_ids:
+                    if str(sender_id) not in Module.current_account().admin_ids:
                         return
 
                     if Utils.Dictionary.get_key_by_subkey(Loader.hooked_modules, cls._name) not in Loader.hooked_modules:
                         return
 
-                    await func(event, **kwargs)
+                    await Module.track(func(event, **kwargs), command=func.__name__)
 
         async def event_handler(event):
+            if not Module.accepting():
+                return
+
             pattern = re.compile(r"\." + func.__name__)
             await wrapper(event, pattern=pattern)
 
         cls.client.add_event_handler(event_handler, events.NewMessage)
-        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func)
+        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func, callback=event_handler)
 
         return wrapper
 
@@ -259,14 +829,17 @@ class Module:
                     if Utils.Dictionary.get_key_by_subkey(Loader.hooked_modules, cls._name) not in Loader.hooked_modules:
                         return
 
-                    await func(event, **kwargs)
+                    await Module.track(func(event, **kwargs), command=func.__name__)
 
         async def event_handler(event):
+            if not Module.accepting():
+                return
+
             pattern = re.compile(r"\." + func.__name__)
             await wrapper(event, pattern=pattern)
 
         cls.client.add_event_handler(event_handler, events.NewMessage)
-        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func)
+        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func, callback=event_handler)
 
         return wrapper
 
@@ -275,19 +848,22 @@ class Module:
         async def wrapper(event, **kwargs):
             if event.raw_text and event.raw_text.split(' ')[0] == f".{func.__name__}":
                 sender_id = event.sender.id if event.sender else event.from_id.user_id
-                if str(sender_id) not in Utils.Config.admin_ids:
+                if str(sender_id) not in Module.current_account().admin_ids:
                     return
 
                 if Utils.Dictionary.get_key_by_subkey(Loader.hooked_modules, cls._name) not in Loader.hooked_modules:
                     return
 
-                await func(event, **kwargs)
+                await Module.track(func(event, **kwargs), command=func.__name__)
 
         async def event_handler(event):
+            if not Module.accepting():
+                return
+
             await wrapper(event)
 
         cls.client.add_event_handler(event_handler, events.NewMessage)
-        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func)
+        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func, callback=event_handler)
 
         return wrapper
 
@@ -298,15 +874,18 @@ class Module:
                 if Utils.Dictionary.get_key_by_subkey(Loader.hooked_modules, cls._name) not in Loader.hooked_modules:
                     return
 
-                await func(event, **kwargs)
+                await Module.track(func(event, **kwargs), command=func.__name__)
             else:
                 pass
 
         async def event_handler(event):
+            if not Module.accepting():
+                return
+
             await wrapper(event)
 
         cls.client.add_event_handler(event_handler, events.NewMessage)
-        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func)
+        cls.add_command(cls, command=func.__name__, description=func.__doc__ if func.__doc__ else 'None', handler=func, callback=event_handler)
 
         return wrapper
 
@@ -315,7 +894,10 @@ class Module:
         @cls.client.on(events.NewMessage(chats=chats))
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            return await func(*args, **kwargs)
+            if not Module.accepting():
+                return
+
+            return await Module.track(func(*args, **kwargs))
 
         return wrapper
 
@@ -324,7 +906,10 @@ class Module:
         def decorator(func):
             @cls.client.on(events.ChatAction(func=action))
             async def wrapper(event):
-                return await func(event)
+                if not Module.accepting():
+                    return
+
+                return await Module.track(func(event))
 
             return wrapper
 
@@ -334,7 +919,10 @@ class Module:
     def inline_query(cls):
         def decorator(func):
             async def wrapper(*args, **kwargs):
-                await func(*args, **kwargs)
+                if not Module.accepting():
+                    return
+
+                await Module.track(func(*args, **kwargs))
 
             cls.inline.add_event_handler(wrapper, cls.InlineQuery())
             return wrapper
@@ -345,7 +933,10 @@ class Module:
     def callback_query(cls):
         def decorator(func):
             async def wrapper(*args, **kwargs):
-                await func(*args, **kwargs)
+                if not Module.accepting():
+                    return
+
+                await Module.track(func(*args, **kwargs))
 
             cls.inline.add_event_handler(wrapper, cls.CallbackQuery())
             return wrapper
@@ -426,15 +1017,7 @@ class Loader:
         module_name = Loader.get_module_name(module_file_path)
 
         try:
-            async with aiofiles.open(module_file_path, mode='r', encoding='utf-8', errors='ignore') as file:
-                file_content = await file.read()
-                tree = ast.parse(file_content, filename=module_file_path)
-
-            return [
-                node.name
-                for node in ast.walk(tree)
-                if isinstance(node, ast.ClassDef)
-            ]
+            return await asyncio.to_thread(Utils.SymbolIndex.file_symbols, module_file_path, "class")
 
         except Exception as e:
             Loader.moon.error(f"Error getting classes from '{module_name}': {e}")
@@ -445,7 +1028,7 @@ class Loader:
         await Loader.update_module_list()
 
         if module_file in Loader.hooked_modules:
-            Loader.moon.debug(f"Module '{module_file}' already loaded. Skipping hooking.")
+            Loader.moon.debug("Module '%s' already loaded. Skipping hooking.", module_file)
             return
 
         module_path = Loader.get_module(module_file)
@@ -458,8 +1041,9 @@ class Loader:
             spec.loader.exec_module(module)
             Loader.hooked_modules[module_file] = [name for name, obj in inspect.getmembers(module) if inspect.isclass(obj)]
 
-            Loader.moon.debug(f"Module '{module_name}' Hooked.")
+            Loader.moon.debug("Module '%s' Hooked.", module_name)
             Loader.loaded_modules.add(module_name)
+            await asyncio.to_thread(Utils.SymbolIndex.update_file, module_path)
 
         except Exception as e:
             Loader.moon.error(f"'{module_name}': {e}")
@@ -472,6 +1056,7 @@ class Loader:
     @staticmethod
     async def hook_modules() -> None:
         await Loader.update_module_list()
+        await Utils.SymbolIndex.scan_async(".")
 
         for module_file in Loader.module_files:
             await Loader.hook_module(module_file=module_file)
@@ -488,11 +1073,50 @@ class Loader:
             commands_to_remove = list(Module._commands.get(module, []))
 
             for command in commands_to_remove:
-                handler_id = command.get("handler")
-                if handler_id:
-                    Module.client.remove_event_handler(handler_id)
+                callback = command.get("callback")
+                if callback:
+                    Module.client.remove_event_handler(callback)
 
             Module._commands.pop(module, None)
 
         Loader.hooked_modules.pop(module_name, None)
-        Loader.moon.debug(f"Module '{module_name}' unhooked")
+        await asyncio.to_thread(Utils.SymbolIndex.update_file, Loader.get_module(module_name))
+        Loader.moon.debug("Module '%s' unhooked", module_name)
+
+
+class Store(BlobStore):
+    module_folder: str = Loader.module_folder
+
+    @staticmethod
+    async def install(module_file: str, content: bytes) -> str:
+        digest = await asyncio.to_thread(Store.install_sync, module_file, content)
+        Loader.moon.debug("Module '%s' stored as %s", module_file, digest[:12])
+        return digest
+
+    @staticmethod
+    async def commit(module_file: str) -> str:
+        async with aiofiles.open(Loader.get_module(module_file), mode='rb') as file:
+            content = await file.read()
+
+        return await Store.install(module_file, content)
+
+    @staticmethod
+    async def digest(module_file: str) -> str | None:
+        return await asyncio.to_thread(Store.digest_sync, module_file)
+
+    @staticmethod
+    async def rollback(module_file: str, steps: int = 1) -> str | None:
+        if Store.target(module_file, steps) is None:
+            return None
+
+        await Loader.unhook_module(module_file)
+        digest = await asyncio.to_thread(Store.rollback_sync, module_file, steps)
+        await Loader.hook_module_adv(module_file)
+
+        if digest is not None:
+            Loader.moon.debug("Module '%s' rolled back to %s", module_file, digest[:12])
+        return digest
+
+
+Utils.Config.subscribe(Module.apply_config)
+Metrics.collectors.append(Module.collect_metrics)
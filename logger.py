@@ -1,14 +1,27 @@
+import asyncio
+import atexit
+import bisect
+import calendar
+import collections
+import concurrent.futures
+import copy
 import datetime
+import gzip
 import json
+import mmap
+import queue
+import re
+import shutil
+import struct
+import sys
+import threading
+import time
+import warnings
 import yaml
 import logging
 import os
-import zipfile
-import aiofiles
 from enum import IntEnum
 from prettytable import PrettyTable
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
 
 
 class LogLevel(IntEnum):
@@ -24,155 +37,129 @@ class LogLevel(IntEnum):
 
 class Moon:
     class Presets:
-        class CLang(logging.Formatter):
-            def format(self, record):
-                levelname = record.levelname
-                filename = record.filename
-                lineno = record.lineno
-                message = record.getMessage()
+        class Base(logging.Formatter):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.cache: tuple = (None, '')
 
-                if record.levelno == logging.DEBUG:
-                    levelname = 'D'
-                elif record.levelno == logging.INFO:
-                    levelname = 'I'
-                elif record.levelno == logging.WARNING:
-                    levelname = 'W'
-                elif record.levelno == logging.ERROR:
-                    levelname = 'E'
-                elif record.levelno == logging.CRITICAL:
-                    levelname = 'F'
+            def timestamp(self, record: logging.LogRecord) -> str:
+                second = int(record.created)
+                cached_second, prefix = self.cache
 
-                return f"{filename}:{lineno}: {levelname}: {message}"
+                if cached_second != second:
+                    prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+                    self.cache = (second, prefix)
 
-        class Json(logging.Formatter):
-            def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-                return json.dumps(log_data)
+                return f"{prefix}.{int(record.created * 1000000) % 1000000:06d}"
 
-        class Csv(logging.Formatter):
-            def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-                return ','.join(log_data.values())
+        class CLang(logging.Formatter):
+            LEVELS = {
+                logging.DEBUG: 'D',
+                logging.INFO: 'I',
+                logging.WARNING: 'W',
+                logging.ERROR: 'E',
+                logging.CRITICAL: 'F'
+            }
 
-        class Table(logging.Formatter):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-
-                table = PrettyTable()
-                table.field_names = log_data.keys()
-                table.add_row(log_data.values())
+                levelname = self.LEVELS.get(record.levelno, record.levelname)
+                return f"{record.filename}:{record.lineno}: {levelname}: {record.getMessage()}"
 
-                return str(table)
+        class Json(Base):
+            def format(self, record):
+                return f'{{"timestamp": "{self.timestamp(record)}", "level": "{record.levelname}", "message": {json.dumps(record.getMessage())}}}'
 
-        class Html(logging.Formatter):
+        class Csv(Base):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
+                return f"{self.timestamp(record)},{record.levelname},{record.getMessage()}"
 
-                html_log = f"<p>{', '.join(f'<strong>{k}:</strong> {v}' for k, v in log_data.items())}</p>"
-                return html_log
+        class Table(Base):
+            HEADER = ('timestamp', 'level', 'message')
 
-        class Xml(logging.Formatter):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-
-                root = Element('log')
-                for key, value in log_data.items():
-                    SubElement(root, key).text = str(value)
+                row = (self.timestamp(record), record.levelname, record.getMessage())
+
+                if not (row[2].isascii() and row[2].isprintable()):
+                    table = PrettyTable()
+                    table.field_names = self.HEADER
+                    table.add_row(row)
+                    return str(table)
+
+                widths = [max(len(title), len(value)) for title, value in zip(self.HEADER, row)]
+                border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+                return '\n'.join((
+                    border,
+                    '|' + '|'.join(f" {title.center(width)} " for title, width in zip(self.HEADER, widths)) + '|',
+                    border,
+                    '|' + '|'.join(f" {value.center(width)} " for value, width in zip(row, widths)) + '|',
+                    border
+                ))
+
+        class Html(Base):
+            def format(self, record):
+                return f"<p><strong>timestamp:</strong> {self.timestamp(record)}, <strong>level:</strong> {record.levelname}, <strong>message:</strong> {record.getMessage()}</p>"
 
-                return minidom.parseString(tostring(root)).toprettyxml(indent="  ")
+        class Xml(Base):
+            @staticmethod
+            def escape(text: str) -> str:
+                return text.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
 
-        class Markdown(logging.Formatter):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
+                message = record.getMessage()
+                message_node = f"  <message>{self.escape(message)}</message>" if message else "  <message/>"
+
+                return (
+                    '<?xml version="1.0" ?>\n'
+                    '<log>\n'
+                    f"  <timestamp>{self.timestamp(record)}</timestamp>\n"
+                    f"  <level>{record.levelname}</level>\n"
+                    f"{message_node}\n"
+                    '</log>\n'
+                )
+
+        class Markdown(Base):
+            def format(self, record):
+                return f"**timestamp:** {self.timestamp(record)}\n**level:** {record.levelname}\n**message:** {record.getMessage()}"
 
-                markdown_log = '\n'.join([f"**{k}:** {v}" for k, v in log_data.items()])
-                return markdown_log
+        class Yaml(Base):
+            Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
-        class Yaml(logging.Formatter):
             def format(self, record):
                 log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
+                    'timestamp': self.timestamp(record),
                     'level': record.levelname,
                     'message': record.getMessage()
                 }
-                return yaml.dump(log_data, default_flow_style=False)
+                return yaml.dump(log_data, Dumper=self.Dumper, default_flow_style=False)
 
-        class Syslog(logging.Formatter):
+        class Syslog(Base):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-                return f"{log_data['timestamp']} {log_data['level']} {log_data['message']}"
+                return f"{self.timestamp(record)} {record.levelname} {record.getMessage()}"
 
-        class JsonIndented(logging.Formatter):
+        class JsonIndented(Base):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-                return json.dumps(log_data, indent=2)
+                return f'{{\n  "timestamp": "{self.timestamp(record)}",\n  "level": "{record.levelname}",\n  "message": {json.dumps(record.getMessage())}\n}}'
 
-        class Logstash(logging.Formatter):
+        class Logstash(Base):
             def format(self, record):
-                log_data = {
-                    '@timestamp': datetime.datetime.utcnow().isoformat(),
-                    'loglevel': record.levelname,
-                    'message': record.getMessage(),
-                    'logger_name': record.name,
-                    'path': record.pathname,
-                    'line_number': record.lineno
-                }
-                return json.dumps(log_data)
+                return (
+                    f'{{"@timestamp": "{self.timestamp(record)}", "loglevel": "{record.levelname}", '
+                    f'"message": {json.dumps(record.getMessage())}, "logger_name": {json.dumps(record.name)}, '
+                    f'"path": {json.dumps(record.pathname)}, "line_number": {record.lineno}}}'
+                )
 
-        class SimpleHtml(logging.Formatter):
+        class SimpleHtml(Base):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
+                return (
+                    f"<p><strong>Timestamp:</strong> {self.timestamp(record)}<br>"
+                    f"<strong>Level:</strong> {record.levelname}<br>"
+                    f"<strong>Message:</strong> {record.getMessage()}</p>"
+                )
 
-                html_log = f"<p><strong>Timestamp:</strong> {log_data['timestamp']}<br>"
-                html_log += f"<strong>Level:</strong> {log_data['level']}<br>"
-                html_log += f"<strong>Message:</strong> {log_data['message']}</p>"
-
-                return html_log
-
-        class ShortJson(logging.Formatter):
+        class ShortJson(Base):
             def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-                return json.dumps(log_data, separators=(',', ':'))
+                return f'{{"timestamp":"{self.timestamp(record)}","level":"{record.levelname}","message":{json.dumps(record.getMessage())}}}'
 
         class ColoredConsole(logging.Formatter):
             COLORS = {
@@ -186,20 +173,564 @@ class Moon:
                 log_message = super().format(record)
                 return f"{self.COLORS.get(record.levelname, '')}{log_message}{self.RESET}"
 
-        class DelimiterSeparatedJson(logging.Formatter):
-            def format(self, record):
-                log_data = {
-                    'timestamp': datetime.datetime.utcnow().isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage()
-                }
-                return json.dumps(log_data, separators=(',', ':'))
+        class DelimiterSeparatedJson(ShortJson):
+            pass
+
+    class Writer:
+        def __init__(self, maxsize: int = 10000, policy: str = "drop", timeout: float = 5.0):
+            self.maxsize = maxsize
+            self.policy = policy
+            self.timeout = timeout
+            self.dropped: int = 0
+            self.queue: queue.Queue = queue.Queue(maxsize)
+            self.thread: threading.Thread | None = None
+            self.lock = threading.Lock()
+
+        def configure(self, maxsize: int | None = None, policy: str | None = None) -> None:
+            with self.lock:
+                if policy is not None:
+                    self.policy = policy
+                if maxsize is not None and maxsize != self.maxsize and self.thread is None:
+                    self.maxsize = maxsize
+                    self.queue = queue.Queue(maxsize)
+
+        def start(self) -> None:
+            with self.lock:
+                if self.thread is not None:
+                    return
+
+                self.thread = threading.Thread(target=self.run, name="MoonWriter", daemon=True)
+                self.thread.start()
+                atexit.register(self.stop)
+
+        def put(self, handlers: tuple, record: logging.LogRecord) -> None:
+            if self.thread is None:
+                self.start()
+
+            if self.policy == "block":
+                self.queue.put((handlers, record))
+                return
+
+            try:
+                self.queue.put_nowait((handlers, record))
+            except queue.Full:
+                self.dropped += 1
+
+        def call(self, function) -> concurrent.futures.Future:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+
+            if self.thread is None or not self.thread.is_alive():
+                future.set_result(function())
+                return future
+
+            self.queue.put((None, (function, future)))
+            return future
+
+        def depth(self) -> int:
+            return self.queue.qsize()
+
+        def run(self) -> None:
+            while True:
+                item = self.queue.get()
+
+                try:
+                    if item is None:
+                        break
+
+                    targets, payload = item
+                    if targets is None:
+                        function, future = payload
+                        try:
+                            future.set_result(function())
+                        except Exception as e:
+                            future.set_exception(e)
+                    else:
+                        Moon.dispatch(targets, payload)
+
+                finally:
+                    self.queue.task_done()
+
+            for handler in list(Moon.shared_handlers.values()):
+                handler.flush()
+
+        def flush(self) -> None:
+            if self.thread is not None and self.thread.is_alive():
+                self.queue.join()
+
+        def stop(self) -> None:
+            with self.lock:
+                thread, self.thread = self.thread, None
+
+            if thread is None or not thread.is_alive():
+                return
+
+            self.queue.put(None)
+            thread.join(self.timeout)
+
+    class QueueHandler(logging.Handler):
+        def __init__(self, writer=None, targets: tuple = ()):
+            super().__init__()
+            self.writer = writer
+            self.targets = targets
+
+        def emit(self, record: logging.LogRecord) -> None:
+            try:
+                if self.writer is None:
+                    Moon.dispatch(self.targets, record)
+                    return
+
+                record = copy.copy(record)
+                record.msg = record.getMessage()
+                record.args = None
+                self.writer.put(self.targets, record)
+
+            except Exception:
+                self.handleError(record)
+
+    class Compressor:
+        def __init__(self, count: int = 10, age: float = 30 * 86400, total_bytes: int = 100 * 1024 * 1024, level: int = 6):
+            self.count = count
+            self.age = age
+            self.total_bytes = total_bytes
+            self.level = level
+            self.executor: concurrent.futures.ThreadPoolExecutor | None = None
+            self.lock = threading.Lock()
+            self.swept: set = set()
+
+        def configure(self, count: int | None = None, age: float | None = None, total_bytes: int | None = None, level: int | None = None) -> None:
+            self.count = self.count if count is None else count
+            self.age = self.age if age is None else age
+            self.total_bytes = self.total_bytes if total_bytes is None else total_bytes
+            self.level = self.level if level is None else level
+
+        def run(self, function, *args) -> concurrent.futures.Future:
+            with self.lock:
+                if self.executor is None:
+                    self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="MoonCompressor")
+
+            return self.executor.submit(function, *args)
+
+        def submit(self, segment: str, log_file: str) -> concurrent.futures.Future:
+            return self.run(self.compress, segment, log_file)
+
+        def compress(self, segment: str, log_file: str) -> str:
+            archive_path = f"{segment}.gz"
+
+            with open(segment, 'rb') as source, gzip.open(archive_path, 'wb', compresslevel=self.level) as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+
+            os.remove(segment)
+
+            if os.path.exists(f"{segment}{Moon.Index.suffix}"):
+                os.replace(f"{segment}{Moon.Index.suffix}", f"{archive_path}{Moon.Index.suffix}")
+
+            self.apply_retention(log_file)
+            return archive_path
+
+        def pending(self, log_file: str) -> list:
+            directory = os.path.dirname(os.path.abspath(log_file))
+            pattern = re.compile(re.escape(os.path.basename(log_file)) + r'\.\d{20}')
+
+            with os.scandir(directory) as entries:
+                return sorted(entry.path for entry in entries if pattern.fullmatch(entry.name) and entry.is_file())
+
+        def sweep(self, log_file: str) -> list:
+            with self.lock:
+                if log_file in self.swept:
+                    return []
+                self.swept.add(log_file)
+
+            futures = [self.submit(segment, log_file) for segment in self.pending(log_file)]
+            if not futures:
+                futures.append(self.run(self.apply_retention, log_file))
+
+            return futures
+
+        def segments(self, log_file: str) -> list:
+            directory = os.path.dirname(os.path.abspath(log_file))
+            prefix = f"{os.path.basename(log_file)}."
+
+            with os.scandir(directory) as entries:
+                segments = [
+                    (entry.path, entry.stat())
+                    for entry in entries
+                    if entry.name.startswith(prefix) and entry.name.endswith(".gz") and entry.is_file()
+                ]
+
+            return sorted(segments, key=lambda segment: segment[1].st_mtime, reverse=True)
+
+        def apply_retention(self, log_file: str) -> list:
+            removed: list = []
+            total: int = 0
+            now = time.time()
+
+            for index, (path, stat) in enumerate(self.segments(log_file)):
+                total += stat.st_size
+
+                if (self.count and index >= self.count) or (self.age and now - stat.st_mtime > self.age) or (self.total_bytes and total > self.total_bytes):
+                    os.remove(path)
+                    removed.append(path)
+
+                    if os.path.exists(f"{path}{Moon.Index.suffix}"):
+                        os.remove(f"{path}{Moon.Index.suffix}")
+
+            return removed
+
+    class Index:
+        suffix: str = ".idx"
+        entry = struct.Struct('<dQ')
+        interval: int = 64 * 1024
+        levels: tuple = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+        short_levels: dict = {b'D': b'DEBUG', b'I': b'INFO', b'W': b'WARNING', b'E': b'ERROR', b'F': b'CRITICAL'}
+        timestamp_pattern = re.compile(rb'(\d{4}-\d{2}-\d{2})([T ])(\d{2}:\d{2}:\d{2})')
+        field_patterns: tuple = (
+            re.compile(rb'\[(?P<name>[^\]]*)\] \[[^\]]*\] - \[(?P<level>[A-Z]+)\]: '),
+            re.compile(rb'\d{4}-\d{2}-\d{2}T[\d:.]+[ ,](?P<level>[A-Z]+)[ ,]'),
+            re.compile(rb'\{.*?"(?:level|loglevel)": ?"(?P<level>[A-Z]+)"(?:.*"logger_name": "(?P<name>[^"]*)")?'),
+            re.compile(rb'\S+:\d+: (?P<level>[DIWEF]): ')
+        )
+
+        @classmethod
+        def fields(cls, line: bytes) -> tuple:
+            for pattern in cls.field_patterns:
+                found = pattern.match(line)
+                if found is None:
+                    continue
+
+                groups = found.groupdict()
+                level = cls.short_levels.get(groups["level"], groups["level"])
+                return level, groups.get("name")
+
+            return None, None
+
+        @staticmethod
+        def file_names(path: str) -> set:
+            base = re.sub(r'\.\d{20}(\.gz)?$', '', os.path.abspath(path))
+
+            return {
+                moon.name
+                for moon in list(Moon.registry.values())
+                if getattr(moon, 'initialized', False) and os.path.abspath(moon.log_file) == base
+            }
+
+        def __init__(self, log_file: str):
+            self.path: str = f"{log_file}{self.suffix}"
+            self.file = None
+            self.last_offset: int = -self.interval
+
+        def add(self, created: float, offset: int) -> None:
+            if offset - self.last_offset < self.interval and offset >= self.last_offset:
+                return
+
+            if self.file is None:
+                self.file = open(self.path, 'ab')
+
+            self.file.write(self.entry.pack(created, offset))
+            self.file.flush()
+            self.last_offset = offset
+
+        def close(self) -> None:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+            self.last_offset = -self.interval
+
+        @classmethod
+        def load(cls, path: str) -> list:
+            try:
+                with open(f"{path}{cls.suffix}", 'rb') as file:
+                    data = file.read()
+            except FileNotFoundError:
+                return []
+
+            usable = len(data) - len(data) % cls.entry.size
+            return sorted(cls.entry.iter_unpack(data[:usable]), key=lambda entry: entry[1])
+
+        @classmethod
+        def bounds(cls, entries: list, size: int, since: float | None, until: float | None) -> tuple:
+            times = [created for created, _ in entries]
+            start, end = 0, size
+
+            if since is not None and entries:
+                position = bisect.bisect_right(times, since) - 1
+                start = entries[position][1] if position >= 0 else 0
+
+            if until is not None and entries:
+                position = bisect.bisect_right(times, until)
+                end = entries[position][1] if position < len(entries) else size
+
+            return start, min(end, size)
+
+        @classmethod
+        def timestamp(cls, line: bytes) -> float | None:
+            match = cls.timestamp_pattern.search(line, 0, 64)
+            if match is None:
+                return None
+
+            parsed = time.strptime(f"{match.group(1).decode()} {match.group(3).decode()}", "%Y-%m-%d %H:%M:%S")
+            return calendar.timegm(parsed) if match.group(2) == b'T' else time.mktime(parsed)
+
+        @staticmethod
+        def name_matches(name: str, candidate: str) -> bool:
+            return candidate == name or candidate.startswith(f"{name}.")
+
+        @classmethod
+        def matcher(cls, level: str | None = None, name: str | None = None, text: str | None = None, since: float | None = None, until: float | None = None, file_names: set | None = None):
+            level_names = {item.encode() for item in cls.levels[cls.levels.index(level.upper()):]} if level and level.upper() in cls.levels else None
+            text_bytes = text.encode() if text else None
+            file_matches = name is not None and any(cls.name_matches(name, candidate) for candidate in file_names or ())
+
+            def match(line: bytes) -> bool:
+                if text_bytes is not None and text_bytes not in line:
+                    return False
+
+                if level_names is not None or name is not None:
+                    line_level, line_name = cls.fields(line)
+
+                    if level_names is not None and line_level not in level_names:
+                        return False
+
+                    if name is not None:
+                        if line_name is not None:
+                            if not cls.name_matches(name, line_name.decode(errors='replace')):
+                                return False
+                        elif not file_matches:
+                            return False
+
+                if since is not None or until is not None:
+                    created = cls.timestamp(line)
+                    if created is not None and ((since is not None and created < since) or (until is not None and created >= until + 1)):
+                        return False
+
+                return True
 
-    def __init__(self, name=__name__, log_file='logger.log', stream_handler: bool = True, file_handler: bool = True, disabled: bool = False, stream_level: int = LogLevel.DEBUG, file_level: int = LogLevel.DEBUG):
+            return match
+
+        @classmethod
+        def search_file(cls, path: str, match, limit: int, since: float | None, until: float | None) -> list:
+            matches: list = []
+
+            with open(path, 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                if size == 0:
+                    return matches
+
+                start, end = cls.bounds(cls.load(path), size, since, until)
+
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    position = end
+                    while position > start and len(matches) < limit:
+                        newline = mapped.rfind(b'\n', start, position - 1)
+                        line_start = newline + 1 if newline >= 0 else start
+                        line = mapped[line_start:position].rstrip(b'\r\n')
+
+                        if line and match(line):
+                            matches.append(line)
+
+                        position = line_start
+
+            return matches[::-1]
+
+        @classmethod
+        def search_archive(cls, path: str, match, limit: int, since: float | None, until: float | None) -> list:
+            entries = cls.load(path)
+
+            if entries:
+                first, last = min(created for created, _ in entries), max(created for created, _ in entries)
+                if (until is not None and first > until) or (since is not None and last < since and os.path.getmtime(path) < since):
+                    return []
+
+            matches: collections.deque = collections.deque(maxlen=limit)
+
+            with gzip.open(path, 'rb') as file:
+                for line in file:
+                    line = line.rstrip(b'\r\n')
+                    if line and match(line):
+                        matches.append(line)
+
+            return list(matches)
+
+        @classmethod
+        def search(cls, folder: str, level: str | None = None, name: str | None = None, text: str | None = None, since: float | None = None, until: float | None = None, limit: int = 50) -> list:
+            results: list = []
+
+            with os.scandir(folder) as entries:
+                files = [(entry.path, entry.stat().st_mtime) for entry in entries if entry.is_file() and entry.name.endswith((".log", ".gz"))]
+
+            for order, (path, modified) in enumerate(sorted(files, key=lambda file: file[1], reverse=True)):
+                if len(results) >= limit and modified < results[0][0]:
+                    break
+
+                match = cls.matcher(level=level, name=name, text=text, since=since, until=until, file_names=cls.file_names(path))
+                search = cls.search_archive if path.endswith(".gz") else cls.search_file
+                created = modified
+
+                for position, line in enumerate(search(path, match, limit, since, until)):
+                    created = cls.timestamp(line) or created
+                    results.append((created, -order, position, os.path.basename(path), line.decode(errors='replace')))
+
+                results = sorted(results)[-limit:]
+
+            return [(file_name, line) for _, _, _, file_name, line in results]
+
+    class RotatingHandler(logging.FileHandler):
+        generations: dict = {}
+
+        def __init__(self, filename: str, max_bytes: int = 0, interval: float = 0, compressor=None):
+            super().__init__(filename)
+            self.max_bytes = max_bytes
+            self.interval = interval
+            self.compressor = compressor
+            self.opened_at: float = time.time()
+            self.generation: int = self.generations.setdefault(self.baseFilename, 0)
+            self.index = Moon.Index(self.baseFilename)
+
+            if self.compressor is not None:
+                self.compressor.sweep(self.baseFilename)
+
+        def reopen(self) -> None:
+            if self.stream is not None:
+                self.stream.close()
+
+            self.index.close()
+            self.stream = self._open()
+            self.generation = self.generations[self.baseFilename]
+
+        def should_rollover(self) -> bool:
+            if self.stream is None:
+                return False
+
+            if self.max_bytes and self.stream.tell() >= self.max_bytes:
+                return True
+
+            return bool(self.interval) and time.time() - self.opened_at >= self.interval
+
+        def emit(self, record: logging.LogRecord) -> None:
+            self.emit_text(record, None)
+
+        def emit_text(self, record: logging.LogRecord, text: str | None) -> None:
+            self.acquire()
+
+            try:
+                try:
+                    if self.generation != self.generations[self.baseFilename]:
+                        self.reopen()
+                        self.opened_at = time.time()
+
+                    if self.should_rollover():
+                        self.rollover()
+
+                    if self.stream is not None:
+                        self.index.add(record.created, self.stream.tell())
+
+                except Exception:
+                    self.handleError(record)
+
+                if text is None:
+                    super().emit(record)
+                    return
+
+                try:
+                    if self.stream is None:
+                        self.stream = self._open()
+
+                    self.stream.write(text + self.terminator)
+                    self.flush()
+                except Exception:
+                    self.handleError(record)
+
+            finally:
+                self.release()
+
+        def rollover(self) -> concurrent.futures.Future | None:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+
+            future = None
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                segment = f"{self.baseFilename}.{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+                os.replace(self.baseFilename, segment)
+
+                self.index.close()
+                if os.path.exists(self.index.path):
+                    os.replace(self.index.path, f"{segment}{self.index.suffix}")
+
+                if self.compressor is not None:
+                    future = self.compressor.submit(segment, self.baseFilename)
+
+            self.generations[self.baseFilename] += 1
+            self.reopen()
+            self.opened_at = time.time()
+            return future
+
+        def force_rollover(self) -> concurrent.futures.Future | None:
+            self.acquire()
+
+            try:
+                return self.rollover()
+            finally:
+                self.release()
+
+    class FormattedHandler(logging.Handler):
+        def __init__(self, target: logging.Handler, formatter: logging.Formatter):
+            super().__init__()
+            self.target = target
+            self.setFormatter(formatter)
+
+        def emit(self, record: logging.LogRecord) -> None:
+            try:
+                self.target.emit_text(record, self.format(record))
+            except Exception:
+                self.handleError(record)
+
+        def flush(self) -> None:
+            self.target.flush()
+
+    writer: Writer = Writer()
+    compressor: Compressor = Compressor()
+    rotation: dict = {"max_bytes": 10 * 1024 * 1024, "interval": 0}
+    rate_limit: int = 0
+    registry: dict = {}
+    shared_handlers: dict = {}
+    registry_lock = threading.RLock()
+
+    def __new__(cls, name=__name__, *args, **kwargs):
+        with cls.registry_lock:
+            instance = cls.registry.get(name)
+
+            if instance is None:
+                instance = super().__new__(cls)
+                instance.initialized = False
+                cls.registry[name] = instance
+
+        return instance
+
+    def __init__(self, name=__name__, log_file='logger.log', stream_handler: bool = True, file_handler: bool = True, disabled: bool = False, stream_level: int = LogLevel.DEBUG, file_level: int = LogLevel.DEBUG, queued: bool = True):
+        options = (os.path.abspath(log_file), bool(stream_handler), bool(file_handler), stream_level, file_level, queued)
+
+        if self.initialized:
+            if options != self.options:
+                warnings.warn(
+                    f"Moon '{name}' already exists with log_file={self.log_file!r}, handlers/levels/queued {self.options[1:]}; "
+                    f"ignoring log_file={log_file!r}, {options[1:]}",
+                    stacklevel=2
+                )
+
+            self.logger.disabled = disabled
+            return
+
+        self.initialized = True
+        self.options = options
         self.name = name
         self.log_file = log_file
         self.file_level = file_level
         self.stream_level = stream_level
+        self.queued = queued
+        self.specs: list = []
+        self.extra_handlers: list = []
+        self.samples: dict = {}
 
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level=self.stream_level)
@@ -207,70 +738,225 @@ class Moon:
 
         self.default_formatter = logging.Formatter("[{name}] [{asctime}] - [{levelname}]: {message}", style='{')
 
+        self.queue_handler = self.QueueHandler(self.writer if queued else None)
+        self.logger.addHandler(self.queue_handler)
+
         self.add_stream_handler() if stream_handler else None
         self.add_file_handler() if file_handler else None
 
+    @classmethod
+    def shutdown(cls) -> None:
+        cls.writer.flush()
+        cls.writer.stop()
+
+    @staticmethod
+    def dispatch(targets: tuple, record: logging.LogRecord) -> None:
+        for handler, level in targets:
+            if record.levelno >= level:
+                handler.handle(record)
+
+    @staticmethod
+    def formatter_key(formatter: logging.Formatter) -> tuple:
+        return type(formatter), getattr(formatter, '_fmt', None), getattr(formatter, 'datefmt', None)
+
+    @classmethod
+    def shared_handler(cls, kind: str, log_file: str | None, formatter: logging.Formatter) -> logging.Handler:
+        if kind != "file":
+            key = (kind, None, cls.formatter_key(formatter))
+
+            with cls.registry_lock:
+                handler = cls.shared_handlers.get(key)
+
+                if handler is None:
+                    handler = cls.shared_handlers[key] = logging.StreamHandler()
+                    handler.setFormatter(formatter)
+
+            return handler
+
+        path = os.path.abspath(log_file)
+
+        with cls.registry_lock:
+            target = cls.shared_handlers.get((kind, path, None))
+
+            if target is None:
+                target = cls.shared_handlers[(kind, path, None)] = cls.RotatingHandler(log_file, compressor=cls.compressor, **cls.rotation)
+                target.setFormatter(formatter)
+
+            if cls.formatter_key(target.formatter) == cls.formatter_key(formatter):
+                return target
+
+            key = (kind, path, cls.formatter_key(formatter))
+            handler = cls.shared_handlers.get(key)
+
+            if handler is None:
+                handler = cls.shared_handlers[key] = cls.FormattedHandler(target, formatter)
+
+        return handler
+
+    @classmethod
+    def release_handlers(cls) -> list:
+        with cls.registry_lock:
+            used = {handler for moon in cls.registry.values() if getattr(moon, 'queue_handler', None) for handler in moon.handlers()}
+            used |= {handler.target for handler in used if isinstance(handler, cls.FormattedHandler)}
+
+            stale = [(key, handler) for key, handler in cls.shared_handlers.items() if handler not in used]
+            for key, _ in stale:
+                del cls.shared_handlers[key]
+
+        if stale:
+            cls.writer.call(lambda: [handler.close() for _, handler in stale])
+
+        return [handler for _, handler in stale]
+
+    def rebuild(self) -> None:
+        targets: dict = {}
+
+        for kind, level, formatter in self.specs:
+            handler = self.shared_handler(kind, self.log_file if kind == "file" else None, formatter)
+            targets[handler] = min(level, targets.get(handler, level))
+
+        for handler, level in self.extra_handlers:
+            targets[handler] = min(level, targets.get(handler, level))
+
+        self.queue_handler.targets = tuple(targets.items())
+        self.release_handlers()
+
+    def handlers(self) -> list:
+        return [handler for handler, _ in self.queue_handler.targets]
+
+    def add_handler(self, handler: logging.Handler, level: int = LogLevel.NOTSET) -> None:
+        self.extra_handlers.append((handler, level))
+        self.rebuild()
+
+    def remove_handler(self, handler: logging.Handler) -> None:
+        self.specs = [
+            (kind, level, formatter)
+            for kind, level, formatter in self.specs
+            if self.shared_handler(kind, self.log_file if kind == "file" else None, formatter) is not handler
+        ]
+        self.extra_handlers = [(extra, level) for extra, level in self.extra_handlers if extra is not handler]
+        self.rebuild()
+
     def add_stream_handler(self):
-        stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(self.stream_level)
-        stream_handler.setFormatter(self.default_formatter)
-        self.logger.addHandler(stream_handler)
+        self.specs.append(("stream", self.stream_level, self.default_formatter))
+        self.rebuild()
 
     def add_file_handler(self, level=logging.DEBUG):
-        file_handler = logging.FileHandler(self.log_file)
-        file_handler.setLevel(self.file_level)
-        file_handler.setFormatter(self.default_formatter)
-        self.logger.addHandler(file_handler)
+        self.specs.append(("file", self.file_level, self.default_formatter))
+        self.rebuild()
 
-    async def archive(self):
-        archive_path = f"{self.log_file}.zip"
+    @classmethod
+    def configure_rotation(cls, max_bytes: int | None = None, interval: float | None = None, **retention) -> None:
+        if max_bytes is not None:
+            cls.rotation["max_bytes"] = max_bytes
+        if interval is not None:
+            cls.rotation["interval"] = interval
+
+        for handler in cls.file_handlers():
+            handler.max_bytes = cls.rotation["max_bytes"]
+            handler.interval = cls.rotation["interval"]
+
+        cls.compressor.configure(**retention)
 
-        async with aiofiles.open(self.log_file, 'rb') as file:
-            async with aiofiles.open(archive_path, 'wb') as zipf:
-                async with zipfile.ZipFile(zipf, 'w') as zip_file:
-                    zip_file.writestr(os.path.basename(self.log_file), await file.read())
+    @classmethod
+    def file_handlers(cls, log_file: str | None = None) -> list:
+        return [
+            handler
+            for handler in list(cls.shared_handlers.values())
+            if isinstance(handler, cls.RotatingHandler) and (log_file is None or handler.baseFilename == os.path.abspath(log_file))
+        ]
 
-        os.remove(self.log_file)
+    @classmethod
+    async def rotate(cls, log_file: str | None = None) -> list:
+        handlers = {handler.baseFilename: handler for handler in cls.file_handlers(log_file)}
 
+        def rollover():
+            return [handler.force_rollover() for handler in handlers.values()]
+
+        futures = await asyncio.wrap_future(cls.writer.call(rollover))
+        return [await asyncio.wrap_future(future) for future in futures if future is not None]
+
+    @classmethod
+    async def search(cls, folder: str, **filters) -> list:
+        await asyncio.wrap_future(cls.writer.call(lambda: None))
+        return await asyncio.to_thread(cls.Index.search, folder, **filters)
+
+    async def archive(self):
+        await self.rotate(self.log_file)
         return self
 
     def set_log_format(self, log_format):
         self.default_formatter = logging.Formatter(log_format, style='{')
-
-        for handler in self.logger.handlers:
-            handler.setFormatter(self.default_formatter)
+        self.set_formatter(self.default_formatter)
 
     def add_formatter(self, formatter):
-        handler = logging.StreamHandler()
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        self.specs.append(("stream", LogLevel.NOTSET, formatter))
+        self.rebuild()
 
     def del_formatters(self):
-        for handler in self.logger.handlers:
-            self.logger.removeHandler(handler)
+        self.specs = []
+        self.extra_handlers = []
+        self.rebuild()
 
     def del_formatter(self, formatter):
-        if formatter in self.logger.handlers:
-            self.logger.removeHandler(formatter)
+        if formatter in self.handlers():
+            self.remove_handler(formatter)
 
     def set_formatter(self, formatter):
-        self.del_formatters()
-        self.add_formatter(formatter=formatter)
+        if not self.specs:
+            self.add_formatter(formatter=formatter)
+            return
+
+        self.specs = [(kind, level, formatter) for kind, level, _ in self.specs]
+        self.rebuild()
+
+    def log(self, level: int, message, *args, exc_info=None, rate: int | None = None) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+
+        limit = self.rate_limit if rate is None else rate
+        if limit and not self.sample(level, message, args, limit):
+            return
+
+        self.logger.log(level, message, *args, exc_info=exc_info, stacklevel=3)
+
+    def sample(self, level: int, message, args: tuple, limit: int) -> bool:
+        if args and isinstance(message, str):
+            key = message
+        else:
+            frame = sys._getframe(3)
+            key = (frame.f_code.co_filename, frame.f_lineno)
+
+        now = int(time.monotonic())
+        window = self.samples.get(key)
+
+        if window is None or window[0] != now:
+            if window is not None and window[2]:
+                self.logger.log(level, "%d similar records suppressed (%s)", window[2], key if isinstance(key, str) else "%s:%d" % key)
+
+            window = self.samples[key] = [now, 0, 0]
+
+        window[1] += 1
+        if window[1] > limit:
+            window[2] += 1
+            return False
+
+        return True
 
-    def debug(self, message, exc_info=None) -> None:
-        self.logger.debug(message, exc_info=exc_info)
+    def debug(self, message, *args, exc_info=None, rate: int | None = None) -> None:
+        self.log(LogLevel.DEBUG, message, *args, exc_info=exc_info, rate=rate)
 
-    def info(self, message, exc_info=None) -> None:
-        self.logger.info(message, exc_info=exc_info)
+    def info(self, message, *args, exc_info=None, rate: int | None = None) -> None:
+        self.log(LogLevel.INFO, message, *args, exc_info=exc_info, rate=rate)
 
-    def warning(self, message, exc_info=None) -> None:
-        self.logger.warning(message, exc_info=exc_info)
+    def warning(self, message, *args, exc_info=None, rate: int | None = None) -> None:
+        self.log(LogLevel.WARNING, message, *args, exc_info=exc_info, rate=rate)
 
-    def error(self, message, exc_info=None) -> None:
-        self.logger.error(message, exc_info=exc_info)
+    def error(self, message, *args, exc_info=None, rate: int | None = None) -> None:
+        self.log(LogLevel.ERROR, message, *args, exc_info=exc_info, rate=rate)
 
-    def critical(self, message, exc_info=None) -> None:
-        self.logger.critical(message, exc_info=exc_info)
+    def critical(self, message, *args, exc_info=None, rate: int | None = None) -> None:
+        self.log(LogLevel.CRITICAL, message, *args, exc_info=exc_info, rate=rate)
 
     def raise_message(self, exception_class, message) -> None:
         if issubclass(exception_class, BaseException):
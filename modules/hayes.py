@@ -16,11 +16,20 @@ class hLoader(loader.Module):
         self.init()
         self.log = self.get_logger()
         self.loader = loader.Loader()
+        self.store = loader.Store
         self.files = self.Utils.Files
         self.hashlib = self.req('hashlib', _importlib=True)
         self.asyncio = self.req('asyncio', _importlib=True)
+        self.tempfile = self.req('tempfile', _importlib=True)
         self.handle()
 
+    async def install_from(self, message, file_name: str) -> str:
+        with self.tempfile.TemporaryDirectory() as folder:
+            file_path = await self.download_file(message, os.path.join(folder, file_name))
+            content = await self.files.read_file(file_path)
+
+        return await self.store.install(file_name, content)
+
     def handle(self):
         @self.strict_owner_command
         async def lm(event) -> None:
@@ -30,8 +39,8 @@ class hLoader(loader.Module):
                 file_name = reply.file.name
                 if any(file_name.lower().endswith(ext) for ext in self.loader.valid_extensions):
                     file_path = os.path.join("modules", file_name)
-                    await self.client.download_media(reply, file_path)
-                    self.log.debug(f"Module '{self.loader.get_module_name(file_name)}' installed")
+                    await self.install_from(reply, file_name)
+                    self.log.debug("Module '%s' installed", self.loader.get_module_name(file_name))
                     await self.loader.hook_module_adv(file_name)
 
                     await event.edit('<b>Loading.</b>', parse_mode='html')
@@ -55,8 +64,8 @@ class hLoader(loader.Module):
                 file_name = event.file.name
 
                 if any(file_name.lower().endswith(ext) for ext in self.loader.valid_extensions):
-                    await event.download_media(os.path.join("modules", file_name))
-                    self.log.debug(f"Module '{self.loader.get_module_name(file_name)}' installed")
+                    await self.install_from(event.message, file_name)
+                    self.log.debug("Module '%s' installed", self.loader.get_module_name(file_name))
                     await self.loader.hook_module_adv(file_name)
 
                     await event.edit('<b>Loading.</b>', parse_mode='html')
@@ -84,11 +93,10 @@ class hLoader(loader.Module):
             file_name = args[0]
             url = ' '.join(args[1:])
 
-            file_path = os.path.join(self.loader.module_folder, file_name)
             file_module_name = self.loader.get_module_name(file_name)
             content = await self.loader.get_content(url=url)
-            await self.files.save_content_to_file(content=content, file_path=file_path)
-            self.log.debug(f"Module '{file_module_name}' installed")
+            await self.store.install(file_name, content)
+            self.log.debug("Module '%s' installed", file_module_name)
             await self.loader.hook_module_adv(file_name)
 
             await event.edit('<b>Loading.</b>', parse_mode='html')
@@ -112,11 +120,10 @@ class hLoader(loader.Module):
             raw_pastebin_url = await self.loader.generate_raw_pastebin_url(past_key)
             content = await self.loader.get_content(raw_pastebin_url)
 
-            file_path = os.path.join(self.loader.module_folder, file_name)
             file_module_name = self.loader.get_module_name(file_name)
 
-            await self.files.save_content_to_file(content=content, file_path=file_path)
-            self.log.debug(f"Module '{file_module_name}' installed")
+            await self.store.install(file_name, content)
+            self.log.debug("Module '%s' installed", file_module_name)
             await self.loader.hook_module_adv(file_name)
 
             await event.edit('<b>Loading.</b>', parse_mode='html')
@@ -145,11 +152,10 @@ class hLoader(loader.Module):
 
             content = await self.loader.get_content(f"{modules_repo}/{module_name}")
 
-            file_path = os.path.join(self.loader.module_folder, module_name)
             file_module_name = self.loader.get_module_name(module_name)
 
-            await self.files.save_content_to_file(content=content, file_path=file_path)
-            self.log.debug(f"Module '{file_module_name}' installed")
+            await self.store.install(module_name, content)
+            self.log.debug("Module '%s' installed", file_module_name)
 
             print(self.loader.hooked_modules)
             await self.loader.hook_module_adv(module_name)
@@ -180,17 +186,16 @@ class hLoader(loader.Module):
 
             github_content = await self.loader.get_content(f"{modules_repo}/{module_name}")
 
-            file_path = os.path.join(self.loader.module_folder, module_name)
             file_module_name = self.loader.get_module_name(module_name)
 
-            file_hash = self.hashlib.sha256(await self.files.read_file(file_path)).hexdigest()
+            file_hash = await self.store.digest(module_name)
             github_hash = self.hashlib.sha256(github_content).hexdigest()
 
             if file_hash != github_hash:
                 await self.loader.unhook_module(module_name)
 
-                await self.files.save_content_to_file(content=github_content, file_path=file_path)
-                self.log.debug(f"Module '{file_module_name}' reinstalled")
+                await self.store.install(module_name, github_content)
+                self.log.debug("Module '%s' reinstalled", file_module_name)
                 await self.loader.hook_module_adv(module_name)
 
                 await event.edit('<b>Loading.</b>', parse_mode='html')
@@ -210,6 +215,34 @@ class hLoader(loader.Module):
                     parse_mode='html'
                 )
 
+        @self.strict_owner_command
+        async def rollback(event) -> None:
+            """mdl_filename + [steps] -> restore a previous module version, negative steps roll forward"""
+            args: list = await self.get_args(event)
+            if not args or not args[0]:
+                await event.edit("<b>Usage</b>: <code>.rollback mdl_filename [steps]</code>", parse_mode='html')
+                return
+
+            module_file: str = args[0]
+            steps: int = int(args[1]) if len(args) > 1 and args[1].lstrip('-').isdigit() else 1
+            module_name = self.loader.get_module_name(module_file)
+
+            digest = await self.store.rollback(module_file, steps=steps)
+
+            if digest is None:
+                await event.edit(
+                    f"<b>No stored version {steps} steps away for module '{module_name}'</b>\n"
+                    f"<b>Stored versions</b>: <code>{len(self.store.versions(module_file))}</code>",
+                    parse_mode='html'
+                )
+                return
+
+            self.log.debug("Module '%s' rolled back", module_name)
+            await event.edit(
+                f"<b>Module '{module_name}' rolled back to <code>{digest[:12]}</code></b>",
+                parse_mode='html'
+            )
+
         @self.strict_owner_command
         async def delm(event) -> None:
             """mdl_filename -> remove module"""
@@ -223,7 +256,7 @@ class hLoader(loader.Module):
                     await self.loader.unhook_module(module_file)
                     os.remove(os.path.join(self.loader.module_folder, module_file))
                     await event.edit(f"<b>Module '{module_name}' Unloaded</b>", parse_mode="html")
-                    self.log.debug(f"Module '{module_name}' Unloaded")
+                    self.log.debug("Module '%s' Unloaded", module_name)
 
                 else:
                     await event.edit(f"<b>Error when removing built-in module ('{hayes_module_name}')</b>", parse_mode="html")
@@ -247,13 +280,14 @@ class hLoader(loader.Module):
 
                 if os.path.exists(module_path):
                     await event.delete()
-                    await event.respond(
+                    await self.respond_file(
+                        event,
+                        module_path,
                         f"<b>The module will be dropped:</b> <code>{str(module_path)}</code>",
-                        parse_mode='html',
-                        file=module_path
+                        parse_mode='html'
                     )
 
-                    self.log.debug(f"Module '{self.loader.get_module_name(module_file)}' Dropped in chat")
+                    self.log.debug("Module '%s' Dropped in chat", self.loader.get_module_name(module_file))
                 else:
                     await event.edit(f"**Module file not found**:\n```{module_file}```", parse_mode="markdown")
                     self.log.error(f"Module file not found: {module_file}")
@@ -282,13 +316,14 @@ class hLoader(loader.Module):
 
                 if os.path.exists(plugin_path):
                     await event.delete()
-                    await event.respond(
+                    await self.respond_file(
+                        event,
+                        plugin_path,
                         "<b>Plugin dropped</b>",
-                        parse_mode='html',
-                        file=plugin_path
+                        parse_mode='html'
                     )
 
-                    self.log.debug(f"Plugin '{self.loader.get_module_name(filename)}' Dropped in chat")
+                    self.log.debug("Plugin '%s' Dropped in chat", self.loader.get_module_name(filename))
                 else:
                     await event.edit(f"**Error**:\n```{self.strings.get('Errors', {}).get('FileNotFound').format('plugin')}```", parse_mode="markdown")
                     self.log.warning(f"Plugin file not found: {filename}")
@@ -308,7 +343,7 @@ class hLoader(loader.Module):
                 file_name = reply.file.name
 
                 if any(file_name.lower().endswith(ext) for ext in self.loader.valid_extensions):
-                    await self.client.download_media(reply, os.path.join(self.loader.plugin_folder, file_name))
+                    await self.download_file(reply, os.path.join(self.loader.plugin_folder, file_name))
 
                     await self.files.append_text_if_not_exists(
                         os.path.join(
@@ -318,7 +353,7 @@ class hLoader(loader.Module):
                         f'import {self.loader.plugin_folder}.{self.loader.get_module_name(module_file=file_name)}'
                     )
 
-                    self.log.debug(f"Plugin {self.loader.plugin_folder}.{self.loader.get_module_name(file_name)} loaded")
+                    self.log.debug("Plugin %s.%s loaded", self.loader.plugin_folder, self.loader.get_module_name(file_name))
                     await event.edit(f"<b>Plugin <code>{self.loader.plugin_folder}.{self.loader.get_module_name(file_name)}</code> loaded</b>", parse_mode="html")
                 else:
                     await event.edit(f"<b>Invalid file extension</b>: <code>{file_name}</code>", parse_mode="html")
@@ -340,7 +375,7 @@ class hLoader(loader.Module):
                     text_to_remove=f"import {self.loader.plugin_folder}.{self.loader.get_module_name(module_file=filename)}"
                 )
                 os.remove(os.path.join(self.loader.plugin_folder, str(filename)))
-                self.log.debug(f"Plugin '{self.loader.get_module_name(filename)}' Unloaded")
+                self.log.debug("Plugin '%s' Unloaded", self.loader.get_module_name(filename))
                 await event.edit(f"<b>Plugin '{self.loader.get_module_name(filename)}' was successfully unloaded</b>", parse_mode="html")
 
             except FileNotFoundError:
@@ -369,18 +404,35 @@ class hMem(loader.Module):
             },
             "directory": {
                 "size_calculated": "[{}] Directory size calculated, current size: {}"
+            },
+            "logs": {
+                "not_found": "<b>No matching log lines</b>",
+                "found": "<b>Last <code>{}</code> matching lines</b>:\n<pre>{}</pre>"
             }
         }
+        self.units: dict = {"s": 1, "m": 60, "h": 3600, "d": 86400}
 
         self.init()
         self.log = self.get_logger()
         self.loader = loader.Loader()
+        self.time = self.req('time', _importlib=True)
+        self.html = self.req('html', _importlib=True)
+        self.datetime = self.req('datetime', _importlib=True)
         self.handle()
 
+    def parse_time(self, value: str) -> float:
+        if value[:-1].isdigit() and value[-1] in self.units:
+            return self.time.time() - int(value[:-1]) * self.units[value[-1]]
+
+        if value.replace('.', '', 1).isdigit():
+            return float(value)
+
+        return self.datetime.datetime.fromisoformat(value).timestamp()
+
     def handle(self):
         @self.strict_owner_command
         async def cachelogs(event):
-            """caches logs in a .zip archive"""
+            """rotates logs into compressed archives"""
             await event.delete()
 
             before_size: int = await self.Utils.Files.get_folder_size_async(
@@ -389,19 +441,11 @@ class hMem(loader.Module):
 
             self.log.debug(self.strings.get("directory", {}).get("size_calculated").format(self.loader.logs_folder, before_size))
 
-            full_log_folder = os.path.join(os.getcwd(), self.loader.logs_folder)
-            files = os.listdir(full_log_folder)
+            files = [handler.baseFilename for handler in self.log.file_handlers()]
 
             self.log.debug(self.strings.get('cachelogs', {}).get("archiving").format(files))
 
-            for file in files:
-                await self.Utils.Files.archive_file(
-                    file_path=os.path.join(
-                        full_log_folder,
-                        file
-                    ),
-                    timestamp=True
-                )
+            await self.log.rotate()
 
             self.log.debug(self.strings.get('cachelogs', {}).get('archived').format(self.loader.logs_folder))
 
@@ -418,13 +462,53 @@ class hMem(loader.Module):
                 parse_mode='html'
             )
 
+        @self.strict_owner_command
+        async def logs(event):
+            """[level=] [name=] [since=] [until=] [limit=] text -> search logs"""
+            filters: dict = {"limit": 20}
+            text: list = []
+
+            for arg in await self.get_args(event, maxsplit=-1):
+                key, _, value = arg.partition('=')
+
+                if key in ("level", "name") and value:
+                    filters[key] = value
+                elif key in ("since", "until") and value:
+                    try:
+                        filters[key] = self.parse_time(value)
+                    except ValueError:
+                        await event.edit(f"<b>Invalid time</b>: <code>{self.html.escape(value)}</code>", parse_mode='html')
+                        return
+                elif key == "limit" and value.isdigit():
+                    filters[key] = int(value)
+                elif arg:
+                    text.append(arg)
+
+            if text:
+                filters["text"] = ' '.join(text)
+
+            started = self.time.perf_counter()
+            results = await self.log.search(self.loader.logs_folder, **filters)
+            self.log.debug("Log search %r: %d lines in %.1f ms", filters, len(results), (self.time.perf_counter() - started) * 1000)
+
+            if not results:
+                await event.edit(self.strings.get("logs", {}).get("not_found"), parse_mode='html')
+                return
+
+            lines: str = '\n'.join(f"{source}: {line}" for source, line in results)[-3500:]
+            await event.edit(
+                self.strings.get("logs", {}).get("found").format(len(results), self.html.escape(lines)),
+                parse_mode='html'
+            )
+
         @self.strict_owner_command
         async def delcache(event):
             """deletes the __pycache__ folder"""
             await event.delete()
 
             before_size: int = await self.Utils.Files.get_folder_size_async(
-                folder_path=self.loader.pycache_folder
+                folder_path=self.loader.pycache_folder,
+                cache=True
             )
 
             self.log.debug(self.strings.get("directory", {}).get("size_calculated").format(self.loader.pycache_folder, before_size))
@@ -445,7 +529,8 @@ class hMem(loader.Module):
             self.log.debug(self.strings.get('delcache', {}).get('cleared'))
 
             after_size: int = await self.Utils.Files.get_folder_size_async(
-                folder_path=self.loader.pycache_folder
+                folder_path=self.loader.pycache_folder,
+                cache=True
             )
 
             self.log.debug(self.strings.get("directory", {}).get("size_calculated").format(self.loader.pycache_folder, after_size))
@@ -483,6 +568,33 @@ class hayes(loader.Module):
             await results[0].click(event.chat_id)
             await event.delete()
 
+        @self.strict_owner_command
+        async def stats(event):
+            """shows runtime metrics"""
+            metrics = self.metrics
+            metrics.collect()
+
+            handlers = sorted(
+                ((dict(key)["handler"], count, total / count) for key, (_, total, count) in metrics.handler_seconds.values.items() if count),
+                key=lambda item: item[1],
+                reverse=True
+            )[:10]
+            top = '\n'.join(f"<code>{name}</code>: {count} in {average * 1000:.1f} ms avg" for name, count, average in handlers) or "None"
+
+            await event.edit(
+                f"<b>Uptime:</b> <code>{self.uptime()}</code>\n"
+                f"<b>Updates:</b> <code>{metrics.updates.total():.0f}</code>\n"
+                f"<b>Commands:</b> <code>{metrics.commands.total():.0f}</code>\n"
+                f"<b>API calls:</b> <code>{metrics.api_calls.total():.0f}</code>\n"
+                f"<b>FloodWait:</b> <code>{metrics.flood_wait.total():.0f}s</code>\n"
+                f"<b>Reconnects:</b> <code>{metrics.reconnects.total():.0f}</code>\n"
+                f"<b>Running handlers:</b> <code>{metrics.inflight.total():.0f}</code>\n"
+                f"<b>Log queue:</b> <code>{metrics.log_queue.total():.0f}</code>\n"
+                f"<b>Loop lag:</b> <code>{metrics.loop_lag.total() * 1000:.1f} ms</code>\n\n"
+                f"<b>Handlers:</b>\n{top}",
+                parse_mode="html"
+            )
+
         @self.inline_query()
         async def inline(event):
             buttons = [self.Btn.inline("Update", b'show_callback')]
@@ -537,7 +649,7 @@ class hayes(loader.Module):
             await event.edit("<b>Closing a thread</b>...", parse_mode="html")
             self.log.debug("Stream closed!")
             await event.edit("<b>Stream closed!</b>", parse_mode="html")
-            self.exit()
+            await self.exit()
 
         @self.strict_owner_command
         async def id(event) -> None:
@@ -588,7 +700,7 @@ class hayes(loader.Module):
 
                 if return_code == 0:
                     await event.reply("**Executed**", parse_mode='markdown')
-                    self.log.debug(f"Executed [{std_output=}, {stderr_output=}, {return_code=}]")
+                    self.log.debug("Executed [std_output=%r, stderr_output=%r, return_code=%r]", std_output, stderr_output, return_code)
                 else:
                     await event.reply(f"**Error**:\n```{stderr_output.decode() if stderr_output.decode() else 'None'}```", parse_mode='markdown')
 
@@ -1,19 +1,22 @@
 import os
+import sys
+import time
 import socket
 import asyncio
 import update
 from loader import (
-    Module, Loader, Utils
+    Module, Loader, Utils, Store, Metrics
 )
 
 
 class Starter:
     def __init__(self) -> None:
+        self.started: float = time.perf_counter()
         self.module = Module
         self.loader = Loader
         self.utils = Utils
-        self.module_updater: update.ModuleUpdater = update.ModuleUpdater()
-        self.updater: update.Updater = update.Updater()
+        self.module_updater: update.ModuleUpdater = update.ModuleUpdater(staging=True)
+        self.updater: update.Updater = update.Updater(staging=True)
         self.strings: dict = {
             "text": "Run as {}@{}: {}",
             "banner_text": "HayesUB 1.3"
@@ -21,23 +24,26 @@ class Starter:
         self.me = None
         self.login = self.get_login()
         self.name = self.get_name()
+        self.update_task: asyncio.Task = None
+        self.config_task: asyncio.Task = None
+        self.metrics_task: asyncio.Task = None
 
-        if self.utils.Config.auto_update:
-            asyncio.run(
-                self.updater.update_all_files()
-            )
+        applied = self.updater.apply_staged()
+        if applied:
+            self.loader.moon.info("Applied staged core updates: %s", applied)
+            os.execv(sys.executable, [sys.executable] + sys.argv)
 
-        self.clear_console()
+        if self.module.active:
+            self.clear_console()
+            self.show_banner()
 
-        if self.utils.Config.module_auto_update:
-            asyncio.run(
-                self.module_updater.update_all_files()
-            )
-
-        self.clear_console()
-        self.show_banner()
         asyncio.run(self.run())
 
+    def log_phase(self, phase: str, started: float) -> float:
+        now = time.perf_counter()
+        self.loader.moon.info("Startup phase '%s': %.3fs (total %.3fs)", phase, now - started, now - self.started)
+        return now
+
     def clear_console(self):
         os.system('cls' if os.name == 'nt' else 'clear')
         return None
@@ -62,23 +68,77 @@ class Starter:
         )
 
     async def start_client(self):
-        await self.module.client.start()
-        self.me = await self.module.get_me()
+        for account in self.module.accounts:
+            await account.start()
+
+        self.me = self.module.accounts[0].me
+
+    async def apply_module_updates(self):
+        for module_file in self.module_updater.staged_files():
+            content = await asyncio.to_thread(self.module_updater.read_staged, module_file)
+            local_path = os.path.join(self.module_updater.local_dir(), module_file)
+
+            await self.loader.unhook_module(module_file)
+            await Store.install(module_file, content)
+            await self.loader.hook_module_adv(module_file)
+
+            self.module_updater.manifest.record(local_path, content, {})
+            self.module_updater.discard_staged(module_file)
+            self.loader.moon.info("Module '%s' updated in place", module_file)
+
+        self.module_updater.manifest.save()
+
+    async def update_in_background(self):
+        started = time.perf_counter()
+
+        try:
+            if self.utils.Config.auto_update:
+                await self.updater.update_all_files(wait_rate_limit=True)
+                if self.updater.staged:
+                    self.loader.moon.info("Core updates staged for next restart: %s", self.updater.staged)
 
-        await self.module.inline.connect()
-        await self.module.inline.sign_in(bot_token=Utils.Config.api_token)
-        await self.module.inline.start()
+            if self.utils.Config.module_auto_update:
+                await self.module_updater.update_all_files(wait_rate_limit=True)
+                await self.apply_module_updates()
+
+        except Exception as e:
+            self.loader.moon.error(f"Background update failed: {e}")
+
+        self.log_phase("background update", started)
+
+    async def on_supervisor_message(self, message: dict):
+        event = message.get("event")
+
+        if event == "activate" and not self.module.active:
+            await self.module.activate()
+            self.loader.moon.info("Activated by supervisor")
+            self.update_task = asyncio.create_task(self.update_in_background())
+
+        elif event == "drain":
+            self.loader.moon.info("Draining for supervisor restart")
+            await self.module.drain()
 
     async def run_client(self):
+        started = time.perf_counter()
         await Loader.hook_modules()
+        self.log_phase("hook modules", started)
 
-        await asyncio.gather(
-            self.module.client.run_until_disconnected(),
-            self.module.inline.run_until_disconnected()
-        )
+        self.config_task = asyncio.create_task(self.utils.Config.watch())
+        self.metrics_task = asyncio.create_task(Metrics.watch())
+
+        if self.module.channel is not None:
+            self.module.channel.listen(self.on_supervisor_message)
+            self.module.channel.send("ready")
+
+        if self.module.active:
+            self.update_task = asyncio.create_task(self.update_in_background())
+
+        await asyncio.gather(*(account.run_until_disconnected() for account in self.module.accounts))
 
     async def run(self):
+        started = self.log_phase("init", self.started)
         await self.start_client()
+        self.log_phase("connect", started)
         await self.show_text_banner()
         await self.run_client()
 
@@ -0,0 +1,588 @@
+from logger import Moon, LogLevel
+from utils import Utils
+
+from telethon import utils
+from telethon.extensions import BinaryReader
+from telethon.sessions import SQLiteSession
+from telethon.sessions.memory import _SentFileType
+from telethon.tl import types
+
+import os
+import json
+import time
+import hashlib
+import struct
+import sqlite3
+import datetime
+import threading
+import collections
+
+
+class EntityCache:
+    save_interval: float = 300.0
+    magic: bytes = b"HEC1"
+
+    def __init__(self, path: str, size: int = 5000, max_age: float = 0):
+        self.path = path
+        self.size = size
+        self.max_age = max_age
+        self.entries: collections.OrderedDict = collections.OrderedDict()
+        self.stamps: dict = {}
+        self.usernames: dict = {}
+        self.lock = threading.RLock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.dirty: bool = False
+        self.saved_at: float = time.monotonic()
+
+    @staticmethod
+    def entities_of(tlo) -> list:
+        if isinstance(tlo, (list, tuple)):
+            return list(tlo)
+
+        entities = [getattr(tlo, attribute, None) for attribute in ('user', 'chat')]
+        for attribute in ('users', 'chats'):
+            values = getattr(tlo, attribute, None)
+            if isinstance(values, list):
+                entities.extend(values)
+
+        return entities
+
+    def key(self, peer) -> int | None:
+        if isinstance(peer, str):
+            return self.usernames.get(peer.lstrip('@').lower())
+
+        try:
+            return utils.get_peer_id(peer)
+        except TypeError:
+            return None
+
+    def expired(self, stamp: float, now: float | None = None) -> bool:
+        return self.max_age > 0 and (now or time.time()) - stamp > self.max_age
+
+    def get(self, peer):
+        with self.lock:
+            key = self.key(peer)
+            entity = self.entries.get(key) if key is not None else None
+
+            if entity is not None and self.expired(self.stamps[key]):
+                self.remove(key)
+                entity = None
+
+            if entity is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entity
+
+    def remove(self, key: int) -> None:
+        entity = self.entries.pop(key)
+        self.stamps.pop(key, None)
+
+        username = getattr(entity, 'username', None)
+        if username and self.usernames.get(username.lower()) == key:
+            del self.usernames[username.lower()]
+
+    def put(self, entity, stamp: float | None = None) -> None:
+        if not isinstance(entity, (types.User, types.Chat, types.Channel)) or getattr(entity, 'min', False):
+            return
+
+        key = utils.get_peer_id(entity)
+
+        with self.lock:
+            self.entries[key] = entity
+            self.entries.move_to_end(key)
+            self.stamps[key] = stamp or time.time()
+
+            username = getattr(entity, 'username', None)
+            if username:
+                self.usernames[username.lower()] = key
+
+            while len(self.entries) > self.size:
+                self.remove(next(iter(self.entries)))
+
+            self.dirty = True
+
+    def put_many(self, tlo) -> None:
+        for entity in self.entities_of(tlo):
+            self.put(entity)
+
+    def fresh(self) -> list:
+        now = time.time()
+        with self.lock:
+            return [entity for key, entity in self.entries.items() if not self.expired(self.stamps[key], now)]
+
+    def seed(self, client) -> int:
+        entities = self.fresh()
+        users = [entity for entity in entities if isinstance(entity, types.User)]
+        chats = [entity for entity in entities if not isinstance(entity, types.User)]
+
+        client._mb_entity_cache.extend(users, chats)
+        session = client.session
+        feed, session.entity_cache = getattr(session, 'entity_cache', None), None
+
+        try:
+            session.process_entities(entities)
+        finally:
+            session.entity_cache = feed
+
+        return len(entities)
+
+    def stats(self) -> dict:
+        return {"size": len(self.entries), "limit": self.size, "hits": self.hits, "misses": self.misses}
+
+    def load(self) -> int:
+        started = time.perf_counter()
+
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return 0
+
+        entities = []
+        stamped = data.startswith(self.magic)
+        offset = len(self.magic) if stamped else 0
+        now = time.time()
+
+        try:
+            while offset < len(data):
+                length, = struct.unpack_from('<I', data, offset)
+                offset += 4
+                stamp = now
+                if stamped:
+                    stamp, = struct.unpack_from('<d', data, offset)
+                    offset += 8
+                entities.append((BinaryReader(data[offset:offset + length]).tgread_object(), stamp))
+                offset += length
+
+        except Exception as e:
+            HayesSession.moon.warning("Entity cache '%s' is unreadable after %d entries: %s", self.path, len(entities), e)
+
+        with self.lock:
+            for entity, stamp in entities:
+                if not self.expired(stamp, now):
+                    self.put(entity, stamp)
+            self.dirty = False
+
+        HayesSession.moon.debug("Entity cache '%s' loaded %d entities in %.1f ms", self.path, len(self.entries), (time.perf_counter() - started) * 1000)
+        return len(self.entries)
+
+    def save(self) -> int:
+        now = time.time()
+        with self.lock:
+            entities = [(entity, self.stamps[key]) for key, entity in self.entries.items() if not self.expired(self.stamps[key], now)]
+            self.dirty = False
+            self.saved_at = time.monotonic()
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(self.magic)
+            for entity, stamp in entities:
+                data = bytes(entity)
+                file.write(struct.pack('<Id', len(data), stamp))
+                file.write(data)
+
+        os.replace(temp_path, self.path)
+        return len(entities)
+
+    def maybe_save(self) -> None:
+        if self.dirty and time.monotonic() - self.saved_at >= self.save_interval:
+            self.save()
+
+
+class CachedSession(SQLiteSession):
+    def __init__(self, session_id: str | None = None):
+        self.entity_cache: EntityCache | None = None
+        super().__init__(session_id)
+
+    def process_entities(self, tlo):
+        if self.save_entities and self.entity_cache is not None:
+            self.entity_cache.put_many(tlo)
+
+        super().process_entities(tlo)
+
+
+class UploadCache:
+    version: int = 1
+    hash_chunk_size: int = 1024 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: dict = {}
+        self.digests: dict = {}
+        self.lock = threading.RLock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def digest(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        path = os.path.abspath(file_path)
+
+        with self.lock:
+            cached = self.digests.get(path)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(self.hash_chunk_size):
+                sha256.update(chunk)
+
+        key = f"{sha256.hexdigest()}:{stat.st_size}"
+        with self.lock:
+            self.digests[path] = (stamp, key)
+
+        return key
+
+    def get(self, key: str) -> types.InputDocument | None:
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return types.InputDocument(entry["id"], entry["access_hash"], bytes.fromhex(entry["file_reference"]))
+
+    def put(self, key: str, media) -> bool:
+        document = getattr(media, 'document', None)
+        if not isinstance(document, types.Document):
+            return False
+
+        with self.lock:
+            self.entries[key] = {
+                "id": document.id,
+                "access_hash": document.access_hash,
+                "file_reference": document.file_reference.hex()
+            }
+
+        return True
+
+    def discard(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+    def load(self) -> int:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            HayesSession.moon.warning("Upload cache '%s' is unreadable: %s", self.path, e)
+            return 0
+
+        if data.get("version") != self.version:
+            return 0
+
+        with self.lock:
+            self.entries.update(data.get("files", {}))
+
+        return len(self.entries)
+
+    def save(self) -> int:
+        with self.lock:
+            data = {"version": self.version, "files": dict(self.entries)}
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+        os.replace(temp_path, self.path)
+        return len(data["files"])
+
+
+class HayesSession(SQLiteSession):
+    flush_interval: float = 1.0
+    moon: Moon = Moon(
+        name="Session",
+        log_file=Utils.Files.log_path("hayes.log"),
+        stream_handler=False,
+        file_level=LogLevel.DEBUG
+    )
+
+    def __init__(self, session_id: str | None = None, flush_interval: float | None = None):
+        self.lock = threading.RLock()
+        self.db_lock = threading.RLock()
+        self.flush_event = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.closed: bool = False
+
+        self.rows: dict = {}
+        self.usernames: dict = {}
+        self.phones: dict = {}
+        self.names: dict = {}
+        self.states: dict = {}
+        self.files: dict = {}
+
+        self.dirty_rows: dict = {}
+        self.dirty_states: dict = {}
+        self.dirty_files: dict = {}
+        self.entity_cache: EntityCache | None = None
+
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+
+        super().__init__(session_id)
+
+        with self.db_lock:
+            if self.filename != ':memory:':
+                self._conn.execute("pragma journal_mode=wal")
+                self._conn.execute("pragma synchronous=normal")
+
+        self.load()
+        self.start()
+
+    def load(self) -> None:
+        started = time.perf_counter()
+
+        with self.db_lock:
+            cursor = self._cursor()
+            try:
+                entities = cursor.execute("select id, hash, username, phone, name, date from entities").fetchall()
+                states = cursor.execute("select id, pts, qts, date, seq from update_state").fetchall()
+                files = cursor.execute("select md5_digest, file_size, type, id, hash from sent_files").fetchall()
+            finally:
+                cursor.close()
+
+        with self.lock:
+            for entity_id, entity_hash, username, phone, name, date in sorted(entities, key=lambda row: row[5] or 0):
+                self.put_row(entity_id, (entity_hash, username, phone, name, date), dirty=False)
+
+            for entity_id, pts, qts, date, seq in states:
+                self.states[entity_id] = types.updates.State(
+                    pts=pts,
+                    qts=qts,
+                    date=datetime.datetime.fromtimestamp(date, tz=datetime.timezone.utc),
+                    seq=seq,
+                    unread_count=0
+                )
+
+            for md5_digest, file_size, file_type, file_id, file_hash in files:
+                self.files[(md5_digest, file_size, file_type)] = (file_id, file_hash)
+
+        self.moon.debug(
+            "Session '%s' loaded %d entities, %d states and %d files in %.1f ms",
+            self.filename, len(self.rows), len(self.states), len(self.files), (time.perf_counter() - started) * 1000
+        )
+
+    def start(self) -> None:
+        if self.filename == ':memory:' or self.thread is not None:
+            return
+
+        self.thread = threading.Thread(target=self.run, name=f"Session-{os.path.basename(self.filename)}", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        while not self.closed:
+            self.flush_event.wait(self.flush_interval)
+            self.flush_event.clear()
+
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                self.moon.error("Session '%s' flush failed: %s", self.filename, e)
+
+            if self.entity_cache is not None:
+                try:
+                    self.entity_cache.maybe_save()
+                except OSError as e:
+                    self.moon.error("Entity cache '%s' save failed: %s", self.entity_cache.path, e)
+
+    def stop(self) -> None:
+        self.closed = True
+        self.flush_event.set()
+
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def put_row(self, entity_id: int, row: tuple, dirty: bool = True) -> None:
+        old = self.rows.get(entity_id)
+        username = row[1]
+
+        if old is not None:
+            for index, value in ((self.usernames, old[1]), (self.phones, old[2]), (self.names, old[3])):
+                if value is not None and index.get(value) == entity_id:
+                    del index[value]
+
+        if username is not None:
+            previous = self.usernames.get(username)
+            if previous is not None and previous != entity_id:
+                previous_row = self.rows[previous]
+                self.rows[previous] = (previous_row[0], None) + previous_row[2:]
+                if dirty:
+                    self.dirty_rows[previous] = self.rows[previous]
+
+            self.usernames[username] = entity_id
+
+        if row[2] is not None:
+            self.phones[row[2]] = entity_id
+        if row[3] is not None:
+            self.names[row[3]] = entity_id
+
+        self.rows[entity_id] = row
+        if dirty:
+            self.dirty_rows[entity_id] = row
+
+    def flush(self) -> int:
+        with self.lock:
+            rows, self.dirty_rows = self.dirty_rows, {}
+            states, self.dirty_states = self.dirty_states, {}
+            files, self.dirty_files = self.dirty_files, {}
+
+        if not (rows or states or files):
+            return 0
+
+        try:
+            with self.db_lock:
+                cursor = self._cursor()
+                try:
+                    cursor.executemany(
+                        "insert or replace into entities values (?,?,?,?,?,?)",
+                        [(entity_id,) + row for entity_id, row in rows.items()]
+                    )
+                    cursor.executemany(
+                        "insert or replace into update_state values (?,?,?,?,?)",
+                        [(entity_id, state.pts, state.qts, state.date.timestamp(), state.seq) for entity_id, state in states.items()]
+                    )
+                    cursor.executemany(
+                        "insert or replace into sent_files values (?,?,?,?,?)",
+                        [key + value for key, value in files.items()]
+                    )
+                finally:
+                    cursor.close()
+
+                self._conn.commit()
+
+        except sqlite3.Error:
+            with self.lock:
+                self.dirty_rows = {**rows, **self.dirty_rows}
+                self.dirty_states = {**states, **self.dirty_states}
+                self.dirty_files = {**files, **self.dirty_files}
+            raise
+
+        return len(rows) + len(states) + len(files)
+
+    def checkpoint(self) -> None:
+        self.flush()
+
+        with self.db_lock:
+            if self._conn is not None and self.filename != ':memory:':
+                self._conn.execute("pragma wal_checkpoint(truncate)")
+
+    def _update_session_table(self):
+        with self.db_lock:
+            super()._update_session_table()
+            self._conn.commit()
+
+    def set_dc(self, dc_id, server_address, port):
+        with self.db_lock:
+            super().set_dc(dc_id, server_address, port)
+
+    def save(self):
+        if self.thread is not None:
+            self.flush_event.set()
+        else:
+            self.flush()
+
+    def close(self):
+        self.stop()
+        self.checkpoint()
+
+        with self.db_lock:
+            super().close()
+
+    def delete(self):
+        self.stop()
+
+        with self.db_lock:
+            super().close()
+
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(self.filename + suffix):
+                os.remove(self.filename + suffix)
+
+        return super().delete()
+
+    def process_entities(self, tlo):
+        if not self.save_entities:
+            return
+
+        if self.entity_cache is not None:
+            self.entity_cache.put_many(tlo)
+
+        rows = self._entities_to_rows(tlo)
+        if not rows:
+            return
+
+        now = int(time.time())
+
+        with self.lock:
+            for entity_id, entity_hash, username, phone, name in rows:
+                old = self.rows.get(entity_id)
+                if old is not None and old[:4] == (entity_hash, username, phone, name):
+                    continue
+
+                self.put_row(entity_id, (entity_hash, username, phone, name, now))
+
+    def get_entity_rows_by_phone(self, phone):
+        entity_id = self.phones.get(phone)
+        if entity_id is not None:
+            return entity_id, self.rows[entity_id][0]
+
+    def get_entity_rows_by_username(self, username):
+        entity_id = self.usernames.get(username)
+        if entity_id is not None:
+            return entity_id, self.rows[entity_id][0]
+
+    def get_entity_rows_by_name(self, name):
+        entity_id = self.names.get(name)
+        if entity_id is not None:
+            return entity_id, self.rows[entity_id][0]
+
+    def get_entity_rows_by_id(self, id, exact=True):
+        ids = (id,) if exact else (
+            utils.get_peer_id(types.PeerUser(id)),
+            utils.get_peer_id(types.PeerChat(id)),
+            utils.get_peer_id(types.PeerChannel(id))
+        )
+
+        for entity_id in ids:
+            row = self.rows.get(entity_id)
+            if row is not None:
+                return entity_id, row[0]
+
+    def get_update_state(self, entity_id):
+        return self.states.get(entity_id)
+
+    def set_update_state(self, entity_id, state):
+        with self.lock:
+            self.states[entity_id] = state
+            self.dirty_states[entity_id] = state
+
+    def get_update_states(self):
+        return list(self.states.items())
+
+    def get_file(self, md5_digest, file_size, cls):
+        value = self.files.get((md5_digest, file_size, _SentFileType.from_type(cls).value))
+        if value is not None:
+            return cls(*value, b'')
+
+    def cache_file(self, md5_digest, file_size, instance):
+        if not isinstance(instance, (types.InputDocument, types.InputPhoto)):
+            raise TypeError('Cannot cache %s instance' % type(instance))
+
+        key = (md5_digest, file_size, _SentFileType.from_type(type(instance)).value)
+
+        with self.lock:
+            self.files[key] = (instance.id, instance.access_hash)
+            self.dirty_files[key] = self.files[key]
@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+from utils import Utils
+
+
+class BlobStore:
+    store_folder: str = ".store"
+    blobs_folder: str = os.path.join(store_folder, "blobs")
+    history_file: str = os.path.join(store_folder, "history.json")
+    module_folder: str = "modules"
+    history_limit: int = 5
+    temp_ttl: float = 3600.0
+    history: dict = {}
+
+    @staticmethod
+    def blob_path(digest: str) -> str:
+        return os.path.join(BlobStore.blobs_folder, digest[:2], digest)
+
+    @classmethod
+    def module_path(cls, module_file: str) -> str:
+        return os.path.join(cls.module_folder, module_file)
+
+    @staticmethod
+    def load_history() -> dict:
+        try:
+            with open(BlobStore.history_file, 'r', encoding='utf-8') as file:
+                history = json.load(file)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            history = {}
+
+        BlobStore.history.clear()
+        for module_file, entry in history.items():
+            if isinstance(entry, list):
+                entry = {"versions": entry, "current": len(entry) - 1}
+            BlobStore.history[module_file] = entry
+
+        return BlobStore.history
+
+    @staticmethod
+    def save_history() -> None:
+        os.makedirs(BlobStore.store_folder, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=BlobStore.store_folder, suffix=".tmp")
+
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            json.dump(BlobStore.history, file)
+
+        os.replace(temp_path, BlobStore.history_file)
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(65536):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _put(content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = BlobStore.blob_path(digest)
+
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix=".tmp")
+
+            with os.fdopen(handle, 'wb') as file:
+                file.write(content)
+
+            os.replace(temp_path, blob_path)
+
+        return digest
+
+    @classmethod
+    def _link(cls, digest: str, module_file: str) -> None:
+        Utils.Files.copy_file(BlobStore.blob_path(digest), cls.module_path(module_file))
+
+    @staticmethod
+    def entry(module_file: str) -> dict:
+        return BlobStore.history.setdefault(module_file, {"versions": [], "current": -1})
+
+    @staticmethod
+    def current(module_file: str) -> str | None:
+        entry = BlobStore.history.get(module_file)
+        if not entry or not entry["versions"]:
+            return None
+
+        return entry["versions"][entry["current"]]
+
+    @staticmethod
+    def _push(module_file: str, digest: str) -> None:
+        entry = BlobStore.entry(module_file)
+        versions: list = entry["versions"]
+
+        if versions and versions[entry["current"]] == digest:
+            return
+
+        if digest in versions:
+            versions.remove(digest)
+
+        versions.append(digest)
+        del versions[:-BlobStore.history_limit]
+        entry["current"] = len(versions) - 1
+        BlobStore.save_history()
+
+    @staticmethod
+    def _collect() -> None:
+        referenced = {digest for entry in BlobStore.history.values() for digest in entry["versions"]}
+
+        if not os.path.isdir(BlobStore.blobs_folder):
+            return
+
+        now = time.time()
+        for prefix in os.listdir(BlobStore.blobs_folder):
+            prefix_path = os.path.join(BlobStore.blobs_folder, prefix)
+            for blob in os.listdir(prefix_path):
+                blob_path = os.path.join(prefix_path, blob)
+
+                if blob.endswith(".tmp"):
+                    try:
+                        if now - os.path.getmtime(blob_path) > BlobStore.temp_ttl:
+                            os.remove(blob_path)
+                    except FileNotFoundError:
+                        pass
+
+                elif blob not in referenced:
+                    os.remove(blob_path)
+
+    @classmethod
+    def install_sync(cls, module_file: str, content: bytes) -> str:
+        cls.load_history()
+        module_path = cls.module_path(module_file)
+
+        if cls.current(module_file) is None and os.path.exists(module_path):
+            with open(module_path, 'rb') as file:
+                cls._push(module_file, cls._put(file.read()))
+
+        digest = cls._put(content)
+        cls._link(digest, module_file)
+        cls._push(module_file, digest)
+        cls._collect()
+        return digest
+
+    @classmethod
+    def digest_sync(cls, module_file: str) -> str | None:
+        module_path = cls.module_path(module_file)
+
+        if not os.path.exists(module_path):
+            return None
+
+        return BlobStore.hash_file(module_path)
+
+    @staticmethod
+    def versions(module_file: str) -> list:
+        return list(BlobStore.history.get(module_file, {}).get("versions", []))
+
+    @staticmethod
+    def target(module_file: str, steps: int) -> str | None:
+        entry = BlobStore.history.get(module_file)
+        if not entry or steps == 0:
+            return None
+
+        index = entry["current"] - steps
+        if not 0 <= index < len(entry["versions"]):
+            return None
+
+        return entry["versions"][index]
+
+    @classmethod
+    def rollback_sync(cls, module_file: str, steps: int = 1) -> str | None:
+        cls.load_history()
+        digest = cls.target(module_file, steps)
+        if digest is None:
+            return None
+
+        cls._link(digest, module_file)
+        entry = BlobStore.history[module_file]
+        entry["current"] = entry["versions"].index(digest)
+        BlobStore.save_history()
+        return digest
+
+
+BlobStore.load_history()
@@ -0,0 +1,278 @@
+import os
+import sys
+import time
+import queue
+import signal
+import asyncio
+import secrets
+import argparse
+import threading
+import subprocess
+from multiprocessing.connection import Client, Listener
+
+
+ADDRESS_ENV: str = "HAYES_SUPERVISOR"
+AUTHKEY_ENV: str = "HAYES_SUPERVISOR_KEY"
+STANDBY_ENV: str = "HAYES_STANDBY"
+
+
+class Channel:
+    def __init__(self, address: tuple, authkey: bytes, standby: bool = False):
+        self.address = address
+        self.authkey = authkey
+        self.standby = standby
+        self.lock = threading.Lock()
+        self.connection = Client(address, authkey=authkey)
+        self.send("hello", pid=os.getpid())
+
+    @classmethod
+    def from_environ(cls) -> "Channel | None":
+        address = os.environ.get(ADDRESS_ENV)
+        if not address:
+            return None
+
+        host, _, port = address.rpartition(':')
+        return cls((host, int(port)), bytes.fromhex(os.environ[AUTHKEY_ENV]), os.environ.get(STANDBY_ENV) == "1")
+
+    def send(self, event: str, **data) -> None:
+        try:
+            with self.lock:
+                self.connection.send({"event": event, **data})
+        except OSError:
+            pass
+
+    def listen(self, callback) -> threading.Thread:
+        loop = asyncio.get_running_loop()
+
+        def run():
+            while True:
+                try:
+                    message = self.connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                asyncio.run_coroutine_threadsafe(callback(message), loop)
+
+        thread = threading.Thread(target=run, name="SupervisorChannel", daemon=True)
+        thread.start()
+        return thread
+
+
+class Supervisor:
+    ready_timeout: float = 180
+    drain_timeout: float = 30
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    stable_after: float = 60.0
+    poll_interval: float = 0.5
+
+    class Child:
+        def __init__(self, process: subprocess.Popen, standby: bool):
+            self.process = process
+            self.standby = standby
+            self.connection = None
+            self.started: float = time.monotonic()
+            self.ready: bool = False
+            self.activated: bool = not standby
+            self.exiting: bool = False
+            self.drain_started: float | None = None
+
+        @property
+        def pid(self) -> int:
+            return self.process.pid
+
+        def send(self, event: str) -> None:
+            if self.connection is None:
+                return
+
+            try:
+                self.connection.send({"event": event})
+            except OSError:
+                pass
+
+    def __init__(self, command: list | None = None):
+        self.command = command or [sys.executable, "-m", "run"]
+        self.authkey: bytes = secrets.token_bytes(32)
+        self.listener = Listener(("127.0.0.1", 0), authkey=self.authkey)
+        self.messages: queue.Queue = queue.Queue()
+        self.children: dict = {}
+        self.current: Supervisor.Child | None = None
+        self.pending: Supervisor.Child | None = None
+        self.draining: list = []
+        self.failures: int = 0
+        self.respawn_at: float | None = None
+        self.stopping: bool = False
+
+    def log(self, message: str, *args) -> None:
+        print(f"[supervisor] {message % args}", flush=True)
+
+    def spawn(self, standby: bool) -> "Supervisor.Child":
+        host, port = self.listener.address
+        environ = dict(os.environ)
+        environ[ADDRESS_ENV] = f"{host}:{port}"
+        environ[AUTHKEY_ENV] = self.authkey.hex()
+        environ[STANDBY_ENV] = "1" if standby else "0"
+
+        child = self.Child(subprocess.Popen(self.command, env=environ), standby)
+        self.children[child.pid] = child
+        self.log("Started child %d%s", child.pid, " (standby)" if standby else "")
+        return child
+
+    def accept(self) -> None:
+        while not self.stopping:
+            try:
+                connection = self.listener.accept()
+                hello = connection.recv()
+            except (EOFError, OSError):
+                continue
+
+            self.messages.put((hello.get("pid"), {"event": "connected", "connection": connection}))
+            threading.Thread(target=self.read, args=(hello.get("pid"), connection), daemon=True).start()
+
+    def read(self, pid: int, connection) -> None:
+        while True:
+            try:
+                self.messages.put((pid, connection.recv()))
+            except (EOFError, OSError):
+                return
+
+    def handle(self, pid: int, message: dict) -> None:
+        child = self.children.get(pid)
+        if child is None:
+            return
+
+        event = message.get("event")
+
+        if event == "connected":
+            child.connection = message["connection"]
+
+        elif event == "ready":
+            child.ready = True
+            self.log("Child %d ready after %.1fs", pid, time.monotonic() - child.started)
+
+            if child is self.pending:
+                self.switch()
+
+        elif event == "restart":
+            if self.pending is None and child is self.current:
+                self.pending = self.spawn(standby=True)
+
+        elif event == "exit":
+            child.exiting = True
+
+    def switch(self) -> None:
+        old, self.current, self.pending = self.current, self.pending, None
+
+        if old is not None and old.process.poll() is None:
+            old.drain_started = time.monotonic()
+            old.send("drain")
+            self.draining.append(old)
+
+        self.log("Switched to child %d, activating once %d draining children exit", self.current.pid, len(self.draining))
+
+    def activate(self) -> None:
+        current = self.current
+        if current is None or current.activated or self.draining:
+            return
+
+        current.activated = True
+        current.send("activate")
+        self.log("Activated child %d", current.pid)
+
+    def reap(self) -> bool:
+        now = time.monotonic()
+
+        for child in list(self.draining):
+            if child.process.poll() is not None:
+                self.draining.remove(child)
+                self.children.pop(child.pid, None)
+                self.log("Child %d drained (exit %s)", child.pid, child.process.returncode)
+            elif now - child.drain_started > self.drain_timeout:
+                self.log("Child %d did not drain in %.0fs, killing it", child.pid, self.drain_timeout)
+                child.process.kill()
+
+        pending = self.pending
+        if pending is not None:
+            if pending.process.poll() is not None:
+                self.log("Replacement child %d exited with %s before it was ready", pending.pid, pending.process.returncode)
+                self.children.pop(pending.pid, None)
+                self.pending = None
+            elif now - pending.started > self.ready_timeout:
+                self.log("Replacement child %d was not ready in %.0fs, keeping the current one", pending.pid, self.ready_timeout)
+                pending.process.kill()
+
+        if self.current is None and self.respawn_at is not None and now >= self.respawn_at:
+            self.respawn_at = None
+            self.current = self.spawn(standby=False)
+
+        self.activate()
+
+        current = self.current
+        if current is None or current.process.poll() is None:
+            return True
+
+        self.children.pop(current.pid, None)
+        code = current.process.returncode
+
+        if current.exiting:
+            self.log("Child %d exited with %s on request", current.pid, code)
+            return False
+
+        if self.pending is not None:
+            self.current, self.pending = self.pending, None
+            self.activate()
+            return True
+
+        self.failures = 0 if now - current.started >= self.stable_after else self.failures + 1
+        delay = min(self.backoff * 2 ** (self.failures - 1), self.max_backoff) if self.failures else 0
+        self.log("Child %d exited with %s, restarting in %.1fs", current.pid, code, delay)
+
+        self.current = None
+        self.respawn_at = now + delay
+        return True
+
+    def stop(self, *_) -> None:
+        self.stopping = True
+        for child in list(self.children.values()):
+            if child.process.poll() is None:
+                child.process.terminate()
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        threading.Thread(target=self.accept, name="SupervisorAccept", daemon=True).start()
+        self.current = self.spawn(standby=False)
+
+        try:
+            while not self.stopping:
+                try:
+                    pid, message = self.messages.get(timeout=self.poll_interval)
+                    self.handle(pid, message)
+                except queue.Empty:
+                    pass
+
+                if not self.reap():
+                    break
+
+        except KeyboardInterrupt:
+            self.stop()
+
+        for child in list(self.children.values()):
+            try:
+                child.process.wait(self.drain_timeout)
+            except subprocess.TimeoutExpired:
+                child.process.kill()
+
+        self.listener.close()
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run HayesUB under a supervisor with zero-downtime restarts.")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Child command, defaults to the current Python running 'run'")
+    args = parser.parse_args()
+
+    sys.exit(Supervisor(args.command or None).run())
+
+
+if __name__ == "__main__":
+    main()
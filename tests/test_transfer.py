@@ -0,0 +1,85 @@
+import os
+import json
+import tempfile
+import unittest
+
+from telethon.tl import types
+
+from transfer import Transfer
+
+
+class Session:
+    dc_id: int = 2
+
+
+class Client:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.session = Session()
+        self.requests: list = []
+
+    async def __call__(self, request):
+        self.requests.append(request.offset)
+        return types.upload.File(types.storage.FilePartial(), 0, self.data[request.offset:request.offset + request.limit])
+
+
+class TestResume(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.folder.name, "file.bin")
+        self.part_path = f"{self.file_path}.part"
+        self.state_path = f"{self.part_path}.json"
+        self.data = os.urandom(4 * 1024)
+        self.document = types.Document(1, 2, b'', None, "application/octet-stream", len(self.data), 2, [])
+
+        self.threshold, self.part_size = Transfer.threshold, Transfer.part_size
+        Transfer.threshold, Transfer.part_size = 0, 1024
+
+    def tearDown(self):
+        Transfer.threshold, Transfer.part_size = self.threshold, self.part_size
+        self.folder.cleanup()
+
+    def write_state(self, done: list) -> None:
+        with open(self.state_path, 'w', encoding='utf-8') as file:
+            json.dump({"id": self.document.id, "size": self.document.size, "part_size": Transfer.part_size, "done": done}, file)
+
+    async def download(self) -> Client:
+        client = Client(self.data)
+        await Transfer.download(client, self.document, self.file_path, senders=1)
+        return client
+
+    async def test_resume_skips_done_parts(self):
+        with open(self.part_path, 'wb') as file:
+            file.write(self.data[:1024] + bytes(len(self.data) - 1024))
+        self.write_state([0])
+
+        client = await self.download()
+
+        self.assertNotIn(0, client.requests)
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(file.read(), self.data)
+
+    async def test_missing_part_discards_state(self):
+        self.write_state([0, 1, 2])
+
+        client = await self.download()
+
+        self.assertEqual(sorted(client.requests), [0, 1024, 2048, 3072])
+        self.assertFalse(os.path.exists(self.state_path))
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(file.read(), self.data)
+
+    async def test_truncated_part_discards_state(self):
+        with open(self.part_path, 'wb') as file:
+            file.write(self.data[:1024])
+        self.write_state([0])
+
+        client = await self.download()
+
+        self.assertIn(0, client.requests)
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(file.read(), self.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
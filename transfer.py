@@ -0,0 +1,298 @@
+from logger import Moon, LogLevel
+from utils import Utils
+
+from telethon import TelegramClient, errors, helpers, utils
+from telethon.network import MTProtoSender
+from telethon.tl import functions, types
+from telethon.tl.alltlobjects import LAYER
+
+import os
+import json
+import time
+import asyncio
+
+
+class Transfer:
+    part_size: int = 512 * 1024
+    threshold: int = 10 * 1024 * 1024
+    checkpoint_interval: float = 1.0
+    retries: int = 5
+    retry_errors: tuple = (errors.ServerError, errors.TimedOutError, ConnectionError)
+    moon: Moon = Moon(
+        name="Transfer",
+        log_file=Utils.Files.log_path("hayes.log"),
+        stream_handler=False,
+        file_level=LogLevel.DEBUG
+    )
+
+    class Senders:
+        def __init__(self, client: TelegramClient, dc_id: int | None, count: int):
+            self.client = client
+            self.dc_id = dc_id if dc_id is not None else client.session.dc_id
+            self.count = max(1, count)
+            self.home: bool = self.dc_id == client.session.dc_id
+            self.borrowed = None
+            self.extra: list = []
+            self.senders: list = []
+            self.lock = asyncio.Lock()
+
+        async def create(self) -> MTProtoSender:
+            if not self.home:
+                return await self.client._create_exported_sender(self.dc_id)
+
+            dc = await self.client._get_dc(self.dc_id)
+            sender = MTProtoSender(self.client.session.auth_key, loggers=self.client._log)
+            await sender.connect(self.client._connection(
+                dc.ip_address,
+                dc.port,
+                dc.id,
+                loggers=self.client._log,
+                proxy=self.client._proxy,
+                local_addr=self.client._local_addr
+            ))
+
+            self.client._init_request.query = functions.help.GetConfigRequest()
+            await sender.send(functions.InvokeWithLayerRequest(LAYER, self.client._init_request))
+            return sender
+
+        async def open(self) -> "Transfer.Senders":
+            if self.home:
+                self.senders.append(self.client)
+            else:
+                self.borrowed = await self.client._borrow_exported_sender(self.dc_id)
+                self.senders.append(self.borrowed)
+
+            for _ in range(self.count - 1):
+                try:
+                    sender = await self.create()
+                except Exception as e:
+                    Transfer.moon.warning("Extra sender for DC %s unavailable, continuing with %d: %s", self.dc_id, len(self.senders), e)
+                    break
+
+                self.extra.append(sender)
+                self.senders.append(sender)
+
+            return self
+
+        async def invoke(self, index: int, request):
+            for attempt in range(1, Transfer.retries + 1):
+                async with self.lock:
+                    sender = self.senders[index % len(self.senders)]
+
+                try:
+                    if sender is self.client:
+                        return await self.client(request)
+
+                    return await sender.send(request)
+
+                except errors.FileMigrateError as e:
+                    if attempt == Transfer.retries:
+                        raise
+                    await self.migrate(e.new_dc)
+
+                except errors.FloodWaitError as e:
+                    if attempt == Transfer.retries or e.seconds > self.client.flood_sleep_threshold:
+                        raise
+                    Transfer.moon.warning("FloodWait of %ds on transfer part, sleeping", e.seconds)
+                    await asyncio.sleep(e.seconds)
+
+                except Transfer.retry_errors as e:
+                    if attempt == Transfer.retries:
+                        raise
+                    Transfer.moon.warning("Transfer part failed on attempt %d/%d: %s", attempt, Transfer.retries, e)
+                    await asyncio.sleep(self.client._retry_delay)
+
+        async def migrate(self, dc_id: int) -> None:
+            async with self.lock:
+                if dc_id == self.dc_id:
+                    return
+
+                Transfer.moon.debug("File moved from DC %s to DC %s, reopening %d senders", self.dc_id, dc_id, len(self.senders))
+                await self.close()
+                self.dc_id = dc_id
+                self.home = dc_id == self.client.session.dc_id
+                await self.open()
+
+        async def close(self) -> None:
+            for sender in self.extra:
+                await sender.disconnect()
+
+            if self.borrowed is not None:
+                await self.client._return_exported_sender(self.borrowed)
+
+            self.borrowed = None
+            self.extra = []
+            self.senders = []
+
+    @staticmethod
+    def workers() -> int:
+        return max(1, Utils.Config.transfer_workers)
+
+    @staticmethod
+    def document(media) -> types.Document | None:
+        if isinstance(media, types.Message):
+            media = media.media
+
+        if isinstance(media, types.MessageMediaDocument):
+            media = media.document
+
+        return media if isinstance(media, types.Document) else None
+
+    @staticmethod
+    def read_state(state_path: str, part_path: str, document: types.Document, part_size: int) -> set:
+        try:
+            size = os.path.getsize(part_path)
+        except OSError:
+            size = None
+
+        if size != document.size:
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            return set()
+
+        try:
+            with open(state_path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return set()
+
+        if (state.get("id"), state.get("size"), state.get("part_size")) != (document.id, document.size, part_size):
+            return set()
+
+        return set(state.get("done", []))
+
+    @staticmethod
+    def write_state(state_path: str, document: types.Document, part_size: int, done: set) -> None:
+        temp_path = f"{state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"id": document.id, "size": document.size, "part_size": part_size, "done": sorted(done)}, file)
+
+        os.replace(temp_path, state_path)
+
+    @staticmethod
+    def prepare(part_path: str, size: int, resume: bool) -> None:
+        with open(part_path, 'r+b' if resume and os.path.exists(part_path) else 'wb') as file:
+            file.truncate(size)
+
+    @staticmethod
+    def write_part(part_path: str, offset: int, data: bytes) -> None:
+        fd = os.open(part_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, data, offset)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def read_part(file_path: str, offset: int, size: int) -> bytes:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            return os.pread(fd, size, offset)
+        finally:
+            os.close(fd)
+
+    @classmethod
+    async def run(cls, parts: list, worker) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        for part in parts:
+            queue.put_nowait(part)
+
+        async def consume(index: int):
+            while not queue.empty():
+                await worker(index, queue.get_nowait())
+
+        tasks = [asyncio.create_task(consume(index)) for index in range(min(cls.workers(), len(parts)))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @classmethod
+    async def download(cls, client: TelegramClient, message, file_path: str, progress=None, senders: int | None = None) -> str:
+        document = cls.document(message)
+        if document is None or document.size < cls.threshold:
+            return await client.download_media(message, file_path)
+
+        dc_id, location = utils.get_input_location(document)
+        part_size = cls.part_size
+        count = (document.size + part_size - 1) // part_size
+        part_path = f"{file_path}.part"
+        state_path = f"{part_path}.json"
+
+        done = await asyncio.to_thread(cls.read_state, state_path, part_path, document, part_size)
+        await asyncio.to_thread(cls.prepare, part_path, document.size, bool(done))
+
+        started = time.perf_counter()
+        resumed = len(done)
+        checkpoint = time.monotonic()
+        pool = await cls.Senders(client, dc_id, Utils.Config.transfer_senders if senders is None else senders).open()
+
+        async def worker(index: int, part: int):
+            nonlocal checkpoint
+            offset = part * part_size
+            result = await pool.invoke(index, functions.upload.GetFileRequest(location, offset=offset, limit=part_size))
+            await asyncio.to_thread(cls.write_part, part_path, offset, result.bytes)
+            done.add(part)
+
+            if progress is not None:
+                progress(min(len(done) * part_size, document.size), document.size)
+
+            if time.monotonic() - checkpoint >= cls.checkpoint_interval:
+                checkpoint = time.monotonic()
+                await asyncio.to_thread(cls.write_state, state_path, document, part_size, set(done))
+
+        try:
+            await cls.run([part for part in range(count) if part not in done], worker)
+        except BaseException:
+            await asyncio.to_thread(cls.write_state, state_path, document, part_size, set(done))
+            raise
+        finally:
+            await pool.close()
+
+        os.replace(part_path, file_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        elapsed = time.perf_counter() - started
+        cls.moon.debug(
+            "Downloaded %s (%d bytes, %d parts, %d resumed) over %d senders in %.2fs, %.1f MiB/s",
+            file_path, document.size, count, resumed, len(pool.senders), elapsed, document.size / max(elapsed, 1e-6) / 1024 / 1024
+        )
+        return file_path
+
+    @classmethod
+    async def upload(cls, client: TelegramClient, file_path: str, progress=None, senders: int | None = None) -> types.InputFile | types.InputFileBig:
+        size = os.path.getsize(file_path)
+        if size < cls.threshold:
+            return await client.upload_file(file_path, progress_callback=progress)
+
+        part_size = cls.part_size
+        count = (size + part_size - 1) // part_size
+        file_id = helpers.generate_random_long()
+        uploaded: int = 0
+
+        started = time.perf_counter()
+        pool = await cls.Senders(client, None, Utils.Config.transfer_senders if senders is None else senders).open()
+
+        async def worker(index: int, part: int):
+            nonlocal uploaded
+            data = await asyncio.to_thread(cls.read_part, file_path, part * part_size, part_size)
+            await pool.invoke(index, functions.upload.SaveBigFilePartRequest(file_id, part, count, data))
+            uploaded += len(data)
+
+            if progress is not None:
+                progress(uploaded, size)
+
+        try:
+            await cls.run(list(range(count)), worker)
+        finally:
+            await pool.close()
+
+        elapsed = time.perf_counter() - started
+        cls.moon.debug(
+            "Uploaded %s (%d bytes, %d parts) over %d senders in %.2fs, %.1f MiB/s",
+            file_path, size, count, len(pool.senders), elapsed, size / max(elapsed, 1e-6) / 1024 / 1024
+        )
+        return types.InputFileBig(file_id, count, os.path.basename(file_path))
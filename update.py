@@ -2,10 +2,17 @@ import asyncio
 import aiohttp
 import aiofiles
 import argparse
+import configparser
 import hashlib
+import json
 import os
+import tarfile
+import tempfile
+import time
+import zipfile
 
 from enum import IntEnum
+from store import BlobStore
 
 
 class CheckResult(IntEnum):
@@ -16,32 +23,270 @@ class CheckResult(IntEnum):
     OUTDATED: int = 4
 
 
-class ModuleUpdater:
-    def __init__(self):
-        self.base_url: str = "https://raw.githubusercontent.com/reslaid/modules/main/Hayes-TL/"
-        self.repo_url: str = "https://api.github.com/repos/reslaid/modules/contents/Hayes-TL"
+STAGING_DIR: str = ".staging"
+CONFIG_PATH: str = "config.cfg"
+
+
+def read_token(config_path: str = CONFIG_PATH) -> str | None:
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    return config.get('git', 'token', fallback='').strip() or None
+
+
+class Manifest:
+    def __init__(self, path: str):
+        self.path: str = path
+        self.entries: dict = {}
+        self.load()
+
+    def load(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self.entries = json.load(file)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+        return self.entries
+
+    def save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2)
+
+        os.replace(temp_path, self.path)
+
+    def get(self, file_name: str) -> dict:
+        return self.entries.get(file_name, {})
+
+    def set(self, file_name: str, **fields) -> None:
+        self.entries.setdefault(file_name, {}).update(fields)
+
+    def remove(self, file_name: str) -> None:
+        self.entries.pop(file_name, None)
+
+    @staticmethod
+    def blob_sha(content: bytes) -> str:
+        return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+    def local_sha(self, file_path: str) -> str | None:
+        file_name = os.path.basename(file_path)
+
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+
+        entry = self.get(file_name)
+        if entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns and entry.get("sha"):
+            return entry["sha"]
+
+        with open(file_path, 'rb') as file:
+            sha = self.blob_sha(file.read())
+
+        self.set(file_name, sha=sha, size=stat.st_size, mtime=stat.st_mtime_ns)
+        return sha
+
+    def conditional_headers(self, file_path: str) -> dict:
+        entry = self.get(os.path.basename(file_path))
+        headers: dict = {}
+
+        if entry.get("sha") and entry.get("sha") == self.local_sha(file_path):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def record(self, file_path: str, content: bytes, headers) -> None:
+        stat = os.stat(file_path)
+        self.set(
+            os.path.basename(file_path),
+            sha=self.blob_sha(content),
+            size=stat.st_size,
+            mtime=stat.st_mtime_ns,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified")
+        )
+
+
+class BaseUpdater:
+    concurrency: int = 8
+    retries: int = 3
+    backoff: float = 0.5
+    timeout: float = 30.0
+    chunk_size: int = 65536
+    staging_name: str = "core"
+    listing_ttl: float = 600.0
+
+    def __init__(self, staging: bool = False):
+        self.staging_dir: str | None = os.path.join(STAGING_DIR, self.staging_name) if staging else None
+        self.staged: list = self.staged_files() + self.staged_removals() if staging else []
+        self.archive_url: str = ""
+        self.archive_subtree: str = ""
+        self.archive_strip: int | None = None
         self.session: aiohttp.ClientSession = None
-        self.valid_extensions = [".py", ".pyc"]
         self.files_to_update: list = []
         self.repository_files: list = []
-        self.modules_dir = "./modules"
+        self.repository_shas: dict = {}
+        self.timings: dict = {}
+        self.token: str | None = read_token()
+        self.rate_limit_reset: float | None = None
 
     async def initialize_session(self):
-        self.session = aiohttp.ClientSession()
-
-    async def update_files_list(self):
-        all_files = [f for f in os.listdir(self.modules_dir) if os.path.isfile(os.path.join(self.modules_dir, f))]
-        self.files_to_update = [file for file in all_files if any(file.lower().endswith(ext) for ext in self.valid_extensions)]
-        self.repository_files = await self.get_repository_files()
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
 
     async def close_session(self):
         await self.session.close()
 
-    async def download_file(self, url: str, local_path: str):
-        async with self.session.get(url) as response:
-            if response.status == 200:
-                async with aiofiles.open(local_path, 'wb') as local_file:
-                    await local_file.write(await response.read())
+    async def request(self, url: str, headers: dict | None = None) -> tuple:
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.session.get(url, headers=headers or {}) as response:
+                    content = await response.read()
+
+                    if response.status < 500 or attempt == self.retries:
+                        return response.status, response.headers, content
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def gather_files(self, handler, files: list) -> list:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self.timings = {}
+
+        async def run(file_path: str):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    return await handler(file_path)
+                finally:
+                    self.timings[file_path] = time.perf_counter() - started
+
+        return await asyncio.gather(*(run(file_path) for file_path in files))
+
+    def print_timings(self, started: float):
+        for file_path, elapsed in sorted(self.timings.items(), key=lambda item: item[1], reverse=True):
+            print(f"{elapsed * 1000:8.1f} ms  {file_path}")
+
+        print(f"Processed {len(self.timings)} files in {time.perf_counter() - started:.2f}s")
+
+    async def download_file(self, url: str, local_path: str) -> bool:
+        status, response_headers, content = await self.request(url, headers=self.manifest.conditional_headers(local_path))
+
+        if status == 200:
+            await asyncio.to_thread(self.write_file, local_path, content, response_headers)
+            return True
+
+        return False
+
+    def install_file(self, target_path: str, content: bytes) -> None:
+        with open(f"{target_path}.tmp", 'wb') as target_file:
+            target_file.write(content)
+
+        os.replace(f"{target_path}.tmp", target_path)
+
+    def write_file(self, local_path: str, content: bytes, headers) -> None:
+        if self.staging_dir:
+            os.makedirs(self.staging_dir, exist_ok=True)
+            BaseUpdater.install_file(self, os.path.join(self.staging_dir, os.path.basename(local_path)), content)
+            self.staged.append(os.path.basename(local_path))
+        else:
+            self.install_file(local_path, content)
+            self.manifest.record(local_path, content, headers)
+
+    def staged_removals(self) -> list:
+        try:
+            with open(os.path.join(self.staging_dir, ".remove"), 'r', encoding='utf-8') as removals:
+                return list(dict.fromkeys(filter(None, removals.read().splitlines())))
+        except FileNotFoundError:
+            return []
+
+    def is_staged(self, file_name: str) -> bool:
+        if not self.staging_dir:
+            return False
+
+        staged_path = os.path.join(self.staging_dir, file_name)
+        remote_sha = self.repository_shas.get(file_name)
+
+        if remote_sha is None or not os.path.isfile(staged_path):
+            return False
+
+        with open(staged_path, 'rb') as staged_file:
+            return Manifest.blob_sha(staged_file.read()) == remote_sha
+
+    def remove_file(self, local_path: str) -> None:
+        file_name = os.path.basename(local_path)
+
+        if self.staging_dir:
+            if file_name in self.staged_removals():
+                return
+
+            os.makedirs(self.staging_dir, exist_ok=True)
+            with open(os.path.join(self.staging_dir, ".remove"), 'a', encoding='utf-8') as removals:
+                removals.write(file_name + "\n")
+            self.staged.append(file_name)
+            return
+
+        os.remove(local_path)
+        self.manifest.remove(file_name)
+
+    def staged_files(self) -> list:
+        if not self.staging_dir or not os.path.isdir(self.staging_dir):
+            return []
+
+        return [file for file in os.listdir(self.staging_dir) if not file.startswith('.') and not file.endswith(".tmp")]
+
+    def read_staged(self, file_name: str) -> bytes:
+        with open(os.path.join(self.staging_dir, file_name), 'rb') as staged_file:
+            return staged_file.read()
+
+    def discard_staged(self, file_name: str) -> None:
+        staged_path = os.path.join(self.staging_dir, file_name)
+
+        if os.path.exists(staged_path):
+            os.remove(staged_path)
+
+        if file_name in self.staged:
+            self.staged.remove(file_name)
+
+    def apply_staged(self) -> list:
+        applied: list = []
+
+        if not self.staging_dir or not os.path.isdir(self.staging_dir):
+            return applied
+
+        removals_path = os.path.join(self.staging_dir, ".remove")
+        if os.path.exists(removals_path):
+            for file_name in self.staged_removals():
+                local_path = os.path.join(self.local_dir(), file_name)
+                if os.path.exists(local_path):
+                    os.remove(local_path)
+                self.manifest.remove(file_name)
+                applied.append(file_name)
+
+            os.remove(removals_path)
+
+        for file_name in self.staged_files():
+            content = self.read_staged(file_name)
+            local_path = os.path.join(self.local_dir(), file_name)
+
+            self.install_file(local_path, content)
+            os.remove(os.path.join(self.staging_dir, file_name))
+            self.manifest.record(local_path, content, {})
+            applied.append(file_name)
+
+        self.staged = []
+        self.manifest.save()
+        return applied
 
     async def calculate_file_hash(self, file_path: str):
         hasher: hashlib._Hash = hashlib.sha256()
@@ -52,47 +297,110 @@ class ModuleUpdater:
 
     async def update_file_if_needed(self, remote_url: str, local_path: str):
         try:
-            remote_hash: str = await self.calculate_remote_file_hash(remote_url)
-            local_hash: str = await self.calculate_file_hash(local_path)
+            if await asyncio.to_thread(self.is_staged, os.path.basename(local_path)):
+                print(f"File is already staged: {local_path}")
+                return
+
+            remote_sha: str | None = self.repository_shas.get(os.path.basename(local_path))
+            local_sha: str | None = await asyncio.to_thread(self.manifest.local_sha, local_path)
+
+            if remote_sha is not None and remote_sha == local_sha:
+                print(f"File is up to date: {local_path}")
 
-            if remote_hash != local_hash:
+            elif await self.download_file(remote_url, local_path):
                 print(f"Updating file: {local_path}")
-                await self.download_file(remote_url, local_path)
+
             else:
                 print(f"File is up to date: {local_path}")
         except Exception as e:
             print(f"Error updating file: {local_path}, {e}")
 
     async def calculate_remote_file_hash(self, url: str):
-        async with self.session.get(url) as response:
-            if response.status == 200:
-                hasher = hashlib.sha256()
-                hasher.update(await response.read())
-                return hasher.hexdigest()
+        status, _, content = await self.request(url)
+        if status == 200:
+            return hashlib.sha256(content).hexdigest()
+
+    async def calculate_remote_file_sha(self, url: str):
+        status, _, content = await self.request(url)
+        if status == 200:
+            return Manifest.blob_sha(content)
+
+    def use_listing(self, items: list) -> list:
+        self.repository_shas = {item["name"]: item.get("sha") for item in items}
+        return [item["name"] for item in items]
+
+    def listing_headers(self, etag: str | None = None) -> dict:
+        headers: dict = {"Accept": "application/vnd.github+json"}
+
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if etag:
+            headers["If-None-Match"] = etag
+
+        return headers
 
     async def get_repository_files(self):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.repo_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    files = [item["name"] for item in data if item["type"] == "file"]
-                    return files
-                else:
-                    print(f"Failed to retrieve files. Status code: {response.status}")
-                    return []
+        cached: dict = self.listing.get(self.repo_url)
+        items: list | None = cached.get("items")
+
+        if items is not None and time.time() - cached.get("fetched_at", 0) < self.listing_ttl:
+            return self.use_listing(items)
+
+        status, headers, content = await self.request(
+            self.repo_url,
+            headers=self.listing_headers(etag=cached.get("etag") if items is not None else None)
+        )
+
+        if status == 304 and items is not None:
+            self.listing.set(self.repo_url, fetched_at=time.time())
+            self.listing.save()
+            return self.use_listing(items)
+
+        if status == 200:
+            data = json.loads(content)
+            items = [{"name": item["name"], "sha": item.get("sha")} for item in data if item["type"] == "file"]
+            self.listing.set(self.repo_url, items=items, etag=headers.get("ETag"), fetched_at=time.time())
+            self.listing.save()
+            return self.use_listing(items)
+
+        if status in (403, 429) and (headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers):
+            if "Retry-After" in headers:
+                self.rate_limit_reset = time.time() + float(headers["Retry-After"])
+            else:
+                self.rate_limit_reset = float(headers.get("X-RateLimit-Reset", time.time() + 60))
+
+            print(f"API rate limit exceeded, resets at {time.strftime('%H:%M:%S', time.localtime(self.rate_limit_reset))}")
+
+            if items is not None:
+                print("Using cached repository listing")
+                return self.use_listing(items)
+
+            return []
+
+        print(f"Failed to retrieve files. Status code: {status}")
+        return []
+
+    async def list_repository(self, wait_rate_limit: bool = False):
+        self.rate_limit_reset = None
+        await self.update_files_list()
+
+        if not self.repository_files and wait_rate_limit and self.rate_limit_reset:
+            delay = max(0.0, self.rate_limit_reset - time.time()) + 1
+            print(f"Retrying repository listing in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            await self.update_files_list()
 
     async def get_content(self, url: str) -> bytes | str:
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    else:
-                        print(f"Failed to download file. Status code: {response.status}")
-                        return None
-            except aiohttp.ClientError as e:
-                print(f"Failed to download file. Error: {e}")
+        try:
+            status, _, content = await self.request(url)
+            if status == 200:
+                return content
+            else:
+                print(f"Failed to download file. Status code: {status}")
                 return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to download file. Error: {e}")
+            return None
 
     async def save_content_to_file(self, content: str, file_path: str) -> bool:
         try:
@@ -103,6 +411,168 @@ class ModuleUpdater:
             print(f"Error saving content to file: {e}")
             return False
 
+    def local_dir(self) -> str:
+        return os.getcwd()
+
+    @staticmethod
+    def split_member(member_path: str) -> list:
+        return [part for part in member_path.replace('\\', '/').split('/') if part and part != '.']
+
+    def archive_names(self, archive_path: str) -> list:
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as archive:
+                return archive.namelist()
+
+        with tarfile.open(archive_path, mode='r|*') as archive:
+            return [info.name for info in archive]
+
+    def detect_strip(self, names: list) -> int:
+        paths = [parts for parts in map(self.split_member, names) if parts]
+
+        roots = {parts[0] for parts in paths}
+        subtree = self.split_member(self.archive_subtree)
+
+        if len(roots) == 1 and roots != set(subtree[:1]) and any(len(parts) > 1 for parts in paths):
+            return 1
+
+        return 0
+
+    def archive_member_name(self, member_path: str, strip: int = 0) -> str | None:
+        parts = self.split_member(member_path)[strip:]
+
+        if self.archive_subtree:
+            subtree = self.archive_subtree.strip('/').split('/')
+            if parts[:len(subtree)] != subtree:
+                return None
+            parts = parts[len(subtree):]
+
+        if len(parts) != 1 or not any(parts[0].lower().endswith(ext) for ext in self.valid_extensions):
+            return None
+
+        return parts[0]
+
+    def iter_archive(self, archive_path: str):
+        strip = self.archive_strip if self.archive_strip is not None else self.detect_strip(self.archive_names(archive_path))
+
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as archive:
+                for info in archive.infolist():
+                    file_name = self.archive_member_name(info.filename, strip)
+                    if file_name and not info.is_dir():
+                        with archive.open(info) as member:
+                            yield file_name, member.read()
+            return
+
+        with tarfile.open(archive_path, mode='r|*') as archive:
+            for info in archive:
+                file_name = self.archive_member_name(info.name, strip)
+                if file_name and info.isfile():
+                    yield file_name, archive.extractfile(info).read()
+
+    def tracked(self, file_name: str) -> bool:
+        return file_name in self.manifest.entries or os.path.exists(os.path.join(self.local_dir(), file_name))
+
+    def apply_archive(self, archive_path: str, install_new: bool = False) -> list:
+        updated: list = []
+
+        for file_name, content in self.iter_archive(archive_path):
+            local_path = os.path.join(self.local_dir(), file_name)
+
+            if not install_new and not self.tracked(file_name):
+                continue
+
+            if self.manifest.local_sha(local_path) == Manifest.blob_sha(content):
+                continue
+
+            self.write_file(local_path, content, {})
+            updated.append(file_name)
+
+        return updated
+
+    async def fetch_archive(self, source: str) -> tuple:
+        if source.startswith("file://"):
+            source = source[len("file://"):]
+
+        if os.path.isfile(source):
+            return source, False
+
+        handle, archive_path = tempfile.mkstemp(suffix=".archive")
+
+        try:
+            with os.fdopen(handle, 'wb') as archive_file:
+                async with self.session.get(source) as response:
+                    if response.status != 200:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=f"Failed to download archive: {source}"
+                        )
+
+                    async for chunk in response.content.iter_chunked(self.chunk_size):
+                        await asyncio.to_thread(archive_file.write, chunk)
+
+        except BaseException:
+            os.remove(archive_path)
+            raise
+
+        return archive_path, True
+
+    async def update_from_archive(self, source: str | None = None, install_new: bool = False) -> list:
+        started = time.perf_counter()
+        source = source or self.archive_url
+
+        await self.initialize_session()
+
+        try:
+            archive_path, temporary = await self.fetch_archive(source)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to download archive. Error: {e}")
+            await self.close_session()
+            return []
+
+        await self.close_session()
+
+        try:
+            updated = await asyncio.to_thread(self.apply_archive, archive_path, install_new)
+        finally:
+            if temporary:
+                os.remove(archive_path)
+
+        self.manifest.save()
+
+        for file_name in updated:
+            print(f"Updating file: {os.path.join(self.local_dir(), file_name)}")
+
+        print(f"Applied {len(updated)} changed files from archive in {time.perf_counter() - started:.2f}s")
+        return updated
+
+
+class ModuleUpdater(BaseUpdater):
+    staging_name: str = "modules"
+
+    def __init__(self, staging: bool = False):
+        super().__init__(staging=staging)
+        self.base_url: str = "https://raw.githubusercontent.com/reslaid/modules/main/Hayes-TL/"
+        self.repo_url: str = "https://api.github.com/repos/reslaid/modules/contents/Hayes-TL"
+        self.valid_extensions = [".py", ".pyc"]
+        self.modules_dir = "./modules"
+        self.archive_url: str = "https://codeload.github.com/reslaid/modules/tar.gz/refs/heads/main"
+        self.archive_subtree: str = "Hayes-TL"
+        self.manifest: Manifest = Manifest(os.path.join(self.modules_dir, ".manifest.json"))
+        self.listing: Manifest = Manifest(os.path.join(self.modules_dir, ".listing.json"))
+
+    def local_dir(self) -> str:
+        return self.modules_dir
+
+    def install_file(self, target_path: str, content: bytes) -> None:
+        BlobStore.install_sync(os.path.basename(target_path), content)
+
+    async def update_files_list(self):
+        all_files = [f for f in os.listdir(self.modules_dir) if os.path.isfile(os.path.join(self.modules_dir, f))]
+        self.files_to_update = [file for file in all_files if any(file.lower().endswith(ext) for ext in self.valid_extensions)]
+        self.repository_files = await self.get_repository_files()
+
     async def load_req_file(self):
         await self.initialize_session()
 
@@ -122,11 +592,31 @@ class ModuleUpdater:
 
         await self.close_session()
 
-    async def check_files(self):
+    async def check_file(self, file_path: str) -> dict | CheckResult:
+        remote_url = self.base_url + file_path
+        local_path = os.path.join(self.modules_dir, file_path)
+
+        if file_path not in self.repository_files:
+            print(f"File not found in the repository: {local_path}")
+            return {"code": CheckResult.NOT_FOUND_IN_REPO}
+
+        local_sha = await asyncio.to_thread(self.manifest.local_sha, local_path)
+        remote_sha = self.repository_shas.get(file_path)
+
+        if remote_sha is None:
+            remote_sha = await self.calculate_remote_file_sha(remote_url)
+
+        if local_sha != remote_sha:
+            print(f'The file is out of date: {local_path}')
+            return {"code": CheckResult.OUTDATED}
+
+        return CheckResult.ACTUAL
+
+    async def check_files(self, wait_rate_limit: bool = False):
         result: dict = {}
 
         await self.initialize_session()
-        await self.update_files_list()
+        await self.list_repository(wait_rate_limit=wait_rate_limit)
 
         if not self.repository_files:
             result["code"] = CheckResult.RATE_LIMIT
@@ -134,135 +624,53 @@ class ModuleUpdater:
             await self.close_session()
             return result
 
-        for file_path in self.files_to_update:
-            remote_url = self.base_url + file_path
-            local_path = os.path.join(self.modules_dir, file_path)
-
-            if file_path not in self.repository_files:
-                result[file_path] = {"code": CheckResult.NOT_FOUND_IN_REPO}
-                print(f"File not found in the repository: {local_path}")
+        results = await self.gather_files(self.check_file, self.files_to_update)
+        result.update(zip(self.files_to_update, results))
 
-            else:
-                local_hash = await self.calculate_file_hash(local_path)
-                remote_hash = await self.calculate_remote_file_hash(remote_url)
+        self.manifest.save()
+        await self.close_session()
+        return result
 
-                if local_hash != remote_hash:
-                    result[file_path] = {"code": CheckResult.OUTDATED}
-                    print(f'The file is out of date: {local_path}')
+    async def update_file(self, file_path: str):
+        remote_url = self.base_url + file_path
+        local_path = os.path.join(self.modules_dir, file_path)
 
-                else:
-                    result[file_path] = CheckResult.ACTUAL
+        await self.update_file_if_needed(remote_url, local_path)
 
-        await self.close_session()
-        return result
+    async def update_all_files(self, wait_rate_limit: bool = False):
+        started = time.perf_counter()
 
-    async def update_all_files(self):
         await self.initialize_session()
-        await self.update_files_list()
+        await self.list_repository(wait_rate_limit=wait_rate_limit)
 
         if not self.repository_files:
             print("API rate limit exceeded")
             await self.close_session()
             return
 
-        for file_path in self.files_to_update:
-            await self.update_files_list()
-
-            remote_url = self.base_url + file_path
-            local_path = os.path.join(self.modules_dir, file_path)
-
-            await self.update_file_if_needed(remote_url, local_path)
+        await self.gather_files(self.update_file, self.files_to_update)
 
+        self.manifest.save()
         await self.close_session()
+        self.print_timings(started)
 
 
-class Updater:
-    def __init__(self):
+class Updater(BaseUpdater):
+    def __init__(self, staging: bool = False):
+        super().__init__(staging=staging)
         self.base_url: str = "https://raw.githubusercontent.com/reslaid/hayesUB/main/"
         self.repo_url: str = "https://api.github.com/repos/reslaid/hayesUB/contents/"
-        self.session: aiohttp.ClientSession = None
         self.req_filename: str = "req.txt"
         self.valid_extensions = [".py", ".pyc", ".sh", ".bat"]
-        self.files_to_update: list = []
-        self.repository_files: list = []
-
-    async def initialize_session(self):
-        self.session = aiohttp.ClientSession()
+        self.archive_url: str = "https://codeload.github.com/reslaid/hayesUB/tar.gz/refs/heads/main"
+        self.manifest: Manifest = Manifest(os.path.join(os.getcwd(), ".manifest.json"))
+        self.listing: Manifest = Manifest(os.path.join(os.getcwd(), ".listing.json"))
 
     async def update_files_list(self):
         all_files = [f for f in os.listdir(os.getcwd()) if os.path.isfile(os.path.join(os.getcwd(), f))]
         self.files_to_update = [file for file in all_files if any(file.lower().endswith(ext) for ext in self.valid_extensions)]
         self.repository_files = await self.get_repository_files()
 
-    async def close_session(self):
-        await self.session.close()
-
-    async def download_file(self, url: str, local_path: str):
-        async with self.session.get(url) as response:
-            if response.status == 200:
-                async with aiofiles.open(local_path, 'wb') as local_file:
-                    await local_file.write(await response.read())
-
-    async def calculate_file_hash(self, file_path: str):
-        hasher: hashlib._Hash = hashlib.sha256()
-        async with aiofiles.open(file_path, 'rb') as file:
-            while chunk := await file.read(8192):
-                hasher.update(chunk)
-        return hasher.hexdigest()
-
-    async def update_file_if_needed(self, remote_url: str, local_path: str):
-        try:
-            remote_hash: str = await self.calculate_remote_file_hash(remote_url)
-            local_hash: str = await self.calculate_file_hash(local_path)
-
-            if remote_hash != local_hash:
-                print(f"Updating file: {local_path}")
-                await self.download_file(remote_url, local_path)
-            else:
-                print(f"File is up to date: {local_path}")
-        except Exception as e:
-            print(f"Error updating file: {local_path}, {e}")
-
-    async def calculate_remote_file_hash(self, url: str):
-        async with self.session.get(url) as response:
-            if response.status == 200:
-                hasher = hashlib.sha256()
-                hasher.update(await response.read())
-                return hasher.hexdigest()
-
-    async def get_repository_files(self):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.repo_url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    files = [item["name"] for item in data if item["type"] == "file"]
-                    return files
-                else:
-                    print(f"Failed to retrieve files. Status code: {response.status}")
-                    return []
-
-    async def get_content(url: str) -> bytes | str:
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.read()
-                    else:
-                        print(f"Failed to download file. Status code: {response.status}")
-                        return None
-            except aiohttp.ClientError as e:
-                print(f"Failed to download file. Error: {e}")
-                return None
-
-    async def save_content_to_file(content: str, file_path: str) -> bool:
-        try:
-            async with aiofiles.open(file_path, mode='wb') as file:
-                await file.write(content)
-            return True
-        except IOError as e:
-            print(f"Error saving content to file: {e}")
-            return False
-
     async def load_req_file(self):
         await self.initialize_session()
 
@@ -273,8 +681,7 @@ class Updater:
 
         if not os.path.exists(local_req_file):
             content = await self.get_content(
-                url="https://raw.githubusercontent.com/reslaid/hayesUB/main/req.txt",
-                local_path=local_req_file
+                url="https://raw.githubusercontent.com/reslaid/hayesUB/main/req.txt"
             )
             await self.save_content_to_file(
                 content=content,
@@ -283,11 +690,35 @@ class Updater:
 
         await self.close_session()
 
-    async def check_files(self):
+    async def check_file(self, file_path: str) -> dict | CheckResult:
+        remote_url = self.base_url + file_path
+        local_path = os.path.join(os.getcwd(), file_path)
+
+        if file_path not in self.repository_files:
+            print(f"File not found in the repository: {local_path}")
+            return {"code": CheckResult.NOT_FOUND_IN_REPO}
+
+        if not os.path.exists(local_path):
+            print(f"Local file is missing: {local_path}")
+            return {"code": CheckResult.FILE_MISSING}
+
+        local_sha = await asyncio.to_thread(self.manifest.local_sha, local_path)
+        remote_sha = self.repository_shas.get(file_path)
+
+        if remote_sha is None:
+            remote_sha = await self.calculate_remote_file_sha(remote_url)
+
+        if local_sha != remote_sha:
+            print(f'The file is out of date: {local_path}')
+            return {"code": CheckResult.OUTDATED}
+
+        return CheckResult.ACTUAL
+
+    async def check_files(self, wait_rate_limit: bool = False):
         result: dict = {}
 
         await self.initialize_session()
-        await self.update_files_list()
+        await self.list_repository(wait_rate_limit=wait_rate_limit)
 
         if not self.repository_files:
             result["code"] = CheckResult.RATE_LIMIT
@@ -295,59 +726,44 @@ class Updater:
             await self.close_session()
             return result
 
-        for file_path in self.files_to_update:
-            remote_url = self.base_url + file_path
-            local_path = os.path.join(os.getcwd(), file_path)
+        results = await self.gather_files(self.check_file, self.files_to_update)
+        result.update(zip(self.files_to_update, results))
 
-            if file_path not in self.repository_files:
-                result[file_path] = {"code": CheckResult.NOT_FOUND_IN_REPO}
-                print(f"File not found in the repository: {local_path}")
+        self.manifest.save()
+        await self.close_session()
+        return result
 
-            elif not os.path.exists(local_path):
-                result[file_path] = {"code": CheckResult.FILE_MISSING}
-                print(f"Local file is missing: {local_path}")
+    async def update_file(self, file_path: str):
+        remote_url = self.base_url + file_path
+        local_path = os.path.join(os.getcwd(), file_path)
 
-            else:
-                local_hash = await self.calculate_file_hash(local_path)
-                remote_hash = await self.calculate_remote_file_hash(remote_url)
+        if file_path not in self.repository_files:
+            print(f"Deleting file: {local_path}")
+            self.remove_file(local_path)
 
-                if local_hash != remote_hash:
-                    result[file_path] = {"code": CheckResult.OUTDATED}
-                    print(f'The file is out of date: {local_path}')
+        elif not os.path.exists(local_path):
+            if not await asyncio.to_thread(self.is_staged, file_path):
+                await self.download_file(remote_url, local_path)
 
-                else:
-                    result[file_path] = CheckResult.ACTUAL
+        else:
+            await self.update_file_if_needed(remote_url, local_path)
 
-        await self.close_session()
-        return result
+    async def update_all_files(self, wait_rate_limit: bool = False):
+        started = time.perf_counter()
 
-    async def update_all_files(self):
         await self.initialize_session()
-        await self.update_files_list()
+        await self.list_repository(wait_rate_limit=wait_rate_limit)
 
         if not self.repository_files:
             print("API rate limit exceeded")
             await self.close_session()
             return
 
-        for file_path in self.files_to_update:
-            await self.update_files_list()
-
-            remote_url = self.base_url + file_path
-            local_path = os.path.join(os.getcwd(), file_path)
-
-            if file_path not in self.repository_files:
-                local_path = os.path.join(os.getcwd(), file_path)
-                print(f"Deleting file: {local_path}")
-                os.remove(local_path)
-
-            else:
-                if not os.path.exists(local_path):
-                    await self.download_file(remote_url, local_path)
-                else:
-                    await self.update_file_if_needed(remote_url, local_path)
+        await self.gather_files(self.update_file, self.files_to_update)
 
+        self.manifest.save()
         await self.close_session()
+        self.print_timings(started)
 
 
 if __name__ == "__main__":
@@ -359,11 +775,34 @@ if __name__ == "__main__":
         help="Check files for relevance"
     )
 
+    parser.add_argument(
+        "--archive",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SOURCE",
+        help="Update from a single repository archive (URL or local .tar.gz/.zip path)"
+    )
+
+    parser.add_argument(
+        "--install-new",
+        action="store_true",
+        help="With --archive, also install files that are not present locally"
+    )
+
+    parser.add_argument(
+        "--modules",
+        action="store_true",
+        help="Update modules instead of the core files"
+    )
+
     args = parser.parse_args()
 
-    updater = Updater()
+    updater = ModuleUpdater() if args.modules else Updater()
     if args.check:
         asyncio.run(updater.check_files())
+    elif args.archive is not None:
+        asyncio.run(updater.update_from_archive(source=args.archive, install_new=args.install_new))
     else:
         asyncio.run(updater.update_all_files())
 
@@ -5,11 +5,19 @@ from typing import Any, List
 
 import os
 import ast
+import json
+import errno
+import threading
+import multiprocessing
+import concurrent.futures
+import shutil
+import tempfile
+import tarfile
 import zipfile
 import pyfiglet
 import asyncio
-import aiofiles
 import datetime
+import time
 import configparser
 
 
@@ -24,29 +32,214 @@ class Utils:
                 self.found = True
 
         async def find_class_in_file(self, file_path: str) -> bool:
+            symbols = await asyncio.to_thread(Utils.SymbolIndex.file_symbols, file_path, "class")
+            return self.class_name in symbols
+
+        def find_class_by_id(self, class_id: int | str, base_folder: str = "."):
+            self.class_name = class_id
+            if not Utils.SymbolIndex.scanned:
+                Utils.SymbolIndex.scan(base_folder)
+
+            for symbol in Utils.SymbolIndex.find(str(class_id), "class"):
+                return symbol["file"]
+
+            return None
+
+    class SymbolIndex:
+        index_path: str = ".symbols.json"
+        version: int = 1
+        workers: int = min(4, os.cpu_count() or 1)
+        pool_threshold: int = 16
+        skip_folders: tuple = ("__pycache__", "logs", "venv")
+        kinds: dict = {ast.ClassDef: "class", ast.FunctionDef: "function", ast.AsyncFunctionDef: "function"}
+        files: dict = {}
+        symbols: dict = {}
+        loaded: bool = False
+        scanned: bool = False
+        lock: threading.RLock = threading.RLock()
+
+        @staticmethod
+        def parse_file(file_path: str) -> tuple:
             try:
-                async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                    tree = ast.parse(await file.read(), filename=file_path)
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
+                    tree = ast.parse(file.read(), filename=file_path)
+
+            except (SyntaxError, ValueError) as e:
+                return [], str(e)
+
+            return [
+                [node.name, Utils.SymbolIndex.kinds[type(node)], node.lineno]
+                for node in ast.walk(tree)
+                if type(node) in Utils.SymbolIndex.kinds
+            ], None
+
+        @staticmethod
+        def module_name(file_path: str, root: str = ".") -> str:
+            relative = os.path.splitext(os.path.relpath(file_path, root))[0]
+            return relative.replace(os.sep, '.')
+
+        @classmethod
+        def load(cls) -> None:
+            with cls.lock:
+                if cls.loaded:
+                    return
+
+                try:
+                    with open(cls.index_path, 'r', encoding='utf-8') as file:
+                        data = json.load(file)
+
+                    if data.get("version") == cls.version:
+                        cls.files = data.get("files", {})
+
+                except (OSError, ValueError):
+                    cls.files = {}
+
+                cls.loaded = True
+                cls.rebuild()
+
+        @classmethod
+        def save(cls) -> None:
+            with cls.lock:
+                temp_path = f"{cls.index_path}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as file:
+                    json.dump({"version": cls.version, "files": cls.files}, file, separators=(',', ':'))
+
+                os.replace(temp_path, cls.index_path)
+
+        @classmethod
+        def rebuild(cls) -> None:
+            symbols: dict = {}
+            for file_path, entry in cls.files.items():
+                for name, kind, line in entry["symbols"]:
+                    symbols.setdefault(name, []).append({
+                        "file": file_path,
+                        "line": line,
+                        "module": entry["module"],
+                        "kind": kind
+                    })
+
+            cls.symbols = symbols
 
-            except SyntaxError as e:
-                Utils.base_logger.error(e)
+        @classmethod
+        def walk(cls, folder: str) -> dict:
+            found: dict = {}
+            pending = [folder]
+
+            while pending:
+                path = pending.pop()
+
+                try:
+                    with os.scandir(path) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not entry.name.startswith('.') and entry.name not in cls.skip_folders:
+                                    pending.append(entry.path)
+                            elif entry.name.endswith('.py') and entry.is_file():
+                                stat = entry.stat()
+                                found[os.path.normpath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+
+            return found
+
+        @classmethod
+        def refresh(cls, stats: dict, root: str = ".") -> bool:
+            stale = [
+                file_path
+                for file_path, (mtime, size) in stats.items()
+                if (entry := cls.files.get(file_path)) is None or entry["mtime"] != mtime or entry["size"] != size
+            ]
+
+            if not stale:
                 return False
 
-            finder = Utils.ClassFinder()
-            finder.class_name = self.class_name
-            finder.visit(tree)
-            return finder.found
+            if len(stale) >= cls.pool_threshold and cls.workers > 1:
+                context = multiprocessing.get_context("spawn")
+                with concurrent.futures.ProcessPoolExecutor(max_workers=cls.workers, mp_context=context) as pool:
+                    results = list(pool.map(cls.parse_file, stale, chunksize=8))
+            else:
+                results = [cls.parse_file(file_path) for file_path in stale]
 
-        def find_class_by_id(self, class_id: int, base_folder: str = "."):
-            self.class_name = class_id
-            for root, dirs, files in os.walk(base_folder):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if file_path.endswith(('.py', '.pyc')):
-                        if self.find_class_in_file(file_path):
-                            return file_path
+            for file_path, (symbols, error) in zip(stale, results):
+                if error is not None:
+                    Utils.base_logger.error("Error indexing '%s': %s", file_path, error)
 
-            return None
+                mtime, size = stats[file_path]
+                cls.files[file_path] = {
+                    "mtime": mtime,
+                    "size": size,
+                    "module": cls.module_name(file_path, root),
+                    "symbols": symbols
+                }
+
+            Utils.base_logger.debug("Indexed %d files", len(stale))
+            return True
+
+        @classmethod
+        def scan(cls, folder: str = ".") -> dict:
+            cls.load()
+
+            with cls.lock:
+                stats = cls.walk(folder)
+                prefix = os.path.normpath(folder)
+                removed = [
+                    file_path for file_path in cls.files
+                    if file_path not in stats and (prefix == '.' or file_path.startswith(prefix + os.sep))
+                ]
+
+                for file_path in removed:
+                    del cls.files[file_path]
+
+                if cls.refresh(stats, folder) or removed:
+                    cls.rebuild()
+                    cls.save()
+
+                cls.scanned = True
+                return cls.symbols
+
+        @classmethod
+        def update_file(cls, file_path: str) -> None:
+            cls.load()
+            file_path = os.path.normpath(file_path)
+
+            with cls.lock:
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    if cls.files.pop(file_path, None) is not None:
+                        cls.rebuild()
+                        cls.save()
+                    return
+
+                if cls.refresh({file_path: (stat.st_mtime_ns, stat.st_size)}):
+                    cls.rebuild()
+                    cls.save()
+
+        @classmethod
+        def file_symbols(cls, file_path: str, kind: str | None = None) -> list:
+            cls.load()
+            file_path = os.path.normpath(file_path)
+
+            with cls.lock:
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    return []
+
+                if cls.refresh({file_path: (stat.st_mtime_ns, stat.st_size)}):
+                    cls.rebuild()
+                    cls.save()
+
+                return [name for name, symbol_kind, _ in cls.files[file_path]["symbols"] if kind is None or symbol_kind == kind]
+
+        @classmethod
+        def find(cls, name: str, kind: str | None = None) -> list:
+            cls.load()
+            return [symbol for symbol in cls.symbols.get(name, []) if kind is None or symbol["kind"] == kind]
+
+        @classmethod
+        async def scan_async(cls, folder: str = ".") -> dict:
+            return await asyncio.to_thread(cls.scan, folder)
 
     class Files:
         @staticmethod
@@ -95,11 +288,62 @@ class Utils:
         def list_directories_in_directory(cls, path_str: str) -> list:
             return [str(directory) for directory in Path(path_str).iterdir() if directory.is_dir()]
 
+        io_inline_limit: int = 64 * 1024
+        io_inline_write_limit: int = 0
+        io_executor: concurrent.futures.ThreadPoolExecutor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4,
+            thread_name_prefix="files"
+        )
+
+        @staticmethod
+        def file_size(path_str: str) -> int:
+            try:
+                return os.stat(path_str).st_size
+            except OSError:
+                return 0
+
+        @classmethod
+        async def run_io(cls, size: int, function, *args, limit: int | None = None):
+            if size <= (cls.io_inline_limit if limit is None else limit):
+                return function(*args)
+
+            return await asyncio.get_running_loop().run_in_executor(cls.io_executor, function, *args)
+
+        @staticmethod
+        def read_sync(path_str: str, mode: str = 'r') -> str | bytes:
+            with open(path_str, mode) as file:
+                return file.read()
+
+        @staticmethod
+        def write_sync(path_str: str, content: str | bytes, mode: str = 'w') -> int:
+            with open(path_str, mode) as file:
+                return file.write(content)
+
+        @staticmethod
+        def append_text_sync(file_path: str, text_to_add: str) -> int | None:
+            with open(file_path, 'r+') as file:
+                if text_to_add in file.read():
+                    return None
+
+                return file.write("\n" + text_to_add)
+
+        @staticmethod
+        def remove_text_sync(file_path: str, text_to_remove: str) -> bool:
+            with open(file_path, 'r') as file:
+                file_content = file.read()
+
+            if text_to_remove not in file_content:
+                return False
+
+            with open(file_path, 'w') as file:
+                file.write(file_content.replace(text_to_remove, ''))
+
+            return True
+
         @classmethod
         async def read_text_file(cls, path_str: str) -> str:
             try:
-                async with aiofiles.open(path_str, 'r') as file:
-                    return await file.read()
+                return await cls.run_io(cls.file_size(path_str), cls.read_sync, path_str)
 
             except Exception as e:
                 Utils.base_logger.error(f"Error reading from file '{path_str}': {e}")
@@ -114,63 +358,172 @@ class Utils:
                     files.append(filepath)
             return files
 
-        @staticmethod
-        async def archive_file(file_path, timestamp: bool = False, strftime: str = "%Y%m%d%H%M%S%f") -> str:
-            timestamp_str = datetime.datetime.utcnow().strftime(strftime)
-            archive_path = f"{file_path}-{timestamp_str}.zip" if timestamp else f"{file_path}.zip"
+        archive_chunk_size: int = 1024 * 1024
+        archive_formats: dict = {"zip": ".zip", "tar.gz": ".tar.gz", "tar.xz": ".tar.xz"}
+
+        class ProgressReader:
+            def __init__(self, file, callback, total: int, done: int = 0):
+                self.file = file
+                self.callback = callback
+                self.total = total
+                self.done = done
+                self.reported = done
+
+            def read(self, size: int = -1) -> bytes:
+                chunk = self.file.read(size)
+                self.done += len(chunk)
+                if self.callback is not None and (self.done - self.reported >= Utils.Files.archive_chunk_size or self.done == self.total):
+                    self.reported = self.done
+                    self.callback(self.done, self.total)
+                return chunk
 
-            async with aiofiles.open(file_path, 'rb') as file:
-                content = await file.read()
+        @classmethod
+        def write_archive(cls, file_paths: List[str], archive_path: str, fmt: str = "zip", level: int = 6, progress=None) -> int:
+            if fmt not in cls.archive_formats:
+                raise ValueError(f"Unsupported archive format: {fmt}")
 
-            with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
-                zip_file.writestr(os.path.basename(file_path), content)
+            total = sum(os.path.getsize(file_path) for file_path in file_paths)
+            done = 0
+            temp_path = f"{archive_path}.part"
 
-            os.remove(file_path)
-            return archive_path
+            try:
+                if fmt == "zip":
+                    with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=level) as archive:
+                        for file_path in file_paths:
+                            archive.write(file_path, os.path.basename(file_path), compresslevel=level)
+                            done += os.path.getsize(file_path)
+
+                            if progress is not None:
+                                progress(done, total)
+                else:
+                    options = {"compresslevel": level} if fmt == "tar.gz" else {"preset": level}
+                    with tarfile.open(temp_path, f"w:{fmt[4:]}", copybufsize=cls.archive_chunk_size, **options) as archive:
+                        for file_path in file_paths:
+                            info = archive.gettarinfo(file_path, os.path.basename(file_path))
 
-        @staticmethod
-        async def get_folder_size_async(folder_path: str) -> int:
-            total_size = 0
-            if os.name == 'nt':
-                for dirpath, dirnames, filenames in os.walk(folder_path):
-                    for filename in filenames:
-                        filepath = os.path.join(dirpath, filename)
-                        async with aiofiles.open(filepath, 'rb') as file:
-                            total_size += await file.stat().st_size()
-            else:
-                for dirpath, dirnames, filenames in os.walk(folder_path):
-                    for filename in filenames:
-                        filepath = os.path.join(dirpath, filename)
-                        stat = await asyncio.to_thread(os.stat, filepath)
-                        total_size += stat.st_size
-            return total_size
+                            with open(file_path, 'rb') as source:
+                                reader = cls.ProgressReader(source, progress, total, done)
+                                archive.addfile(info, reader)
+                                done = reader.done
 
-        @staticmethod
-        async def archive_files(file_paths: List[str], strftime: str = "%Y%m%d%H%M%S%f") -> str:
-            timestamp_str = datetime.datetime.utcnow().strftime(strftime)
-            archive_path = f"cache-{timestamp_str}.zip"
+                os.replace(temp_path, archive_path)
+
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            return done
 
-            async def write_to_zip(zip_file):
+        @classmethod
+        async def archive_files(
+            cls,
+            file_paths: List[str],
+            strftime: str = "%Y%m%d%H%M%S%f",
+            archive_path: str | None = None,
+            fmt: str = "zip",
+            level: int = 6,
+            remove: bool = True,
+            progress=None
+        ) -> str:
+            if archive_path is None:
+                timestamp_str = datetime.datetime.utcnow().strftime(strftime)
+                archive_path = f"cache-{timestamp_str}{cls.archive_formats.get(fmt, '')}"
+
+            loop = asyncio.get_running_loop()
+
+            def report(done: int, total: int):
+                loop.call_soon_threadsafe(progress, done, total)
+
+            callback = report if progress is not None else None
+
+            size = await asyncio.to_thread(cls.write_archive, file_paths, archive_path, fmt, level, callback)
+            Utils.base_logger.debug("Archived %d files (%d bytes) into %s", len(file_paths), size, archive_path)
+
+            if remove:
                 for file_path in file_paths:
-                    async with aiofiles.open(file_path, 'rb') as file:
-                        content = await file.read()
-                        zip_file.writestr(os.path.basename(file_path), content)
+                    await asyncio.to_thread(os.remove, file_path)
+
+            return archive_path
 
-            await asyncio.to_thread(
-                lambda: zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED),
-                write_to_zip
+        @classmethod
+        async def archive_file(
+            cls,
+            file_path,
+            timestamp: bool = False,
+            strftime: str = "%Y%m%d%H%M%S%f",
+            fmt: str = "zip",
+            level: int = 6,
+            remove: bool = True,
+            progress=None
+        ) -> str:
+            timestamp_str = datetime.datetime.utcnow().strftime(strftime)
+            suffix = cls.archive_formats.get(fmt, '')
+            archive_path = f"{file_path}-{timestamp_str}{suffix}" if timestamp else f"{file_path}{suffix}"
+
+            return await cls.archive_files(
+                [file_path],
+                archive_path=archive_path,
+                fmt=fmt,
+                level=level,
+                remove=remove,
+                progress=progress
             )
 
-            for file_path in file_paths:
-                await os.remove(file_path)
+        folder_size_cache: dict = {}
 
-            return archive_path
+        @classmethod
+        def get_folder_size(cls, folder_path: str, cache: bool = False) -> int:
+            total_size = 0
+            pending = [os.fspath(folder_path)]
+
+            while pending:
+                path = pending.pop()
+
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    cls.folder_size_cache.pop(path, None)
+                    continue
+
+                cached = cls.folder_size_cache.get(path) if cache else None
+                if cached is not None and cached[0] == mtime:
+                    total_size += cached[1]
+                    pending.extend(cached[2])
+                    continue
+
+                files_size = 0
+                subdirs = []
+
+                try:
+                    with os.scandir(path) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    subdirs.append(entry.path)
+                                elif entry.is_file():
+                                    files_size += entry.stat().st_size
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+
+                if cache:
+                    cls.folder_size_cache[path] = (mtime, files_size, subdirs)
+
+                total_size += files_size
+                pending.extend(subdirs)
+
+            return total_size
+
+        @classmethod
+        async def get_folder_size_async(cls, folder_path: str, cache: bool = False) -> int:
+            return await asyncio.to_thread(cls.get_folder_size, folder_path, cache)
 
         @classmethod
         async def write_text_file(cls, path_str: str, content: str) -> int:
             try:
-                async with aiofiles.open(path_str, 'w') as file:
-                    return await file.write(content)
+                return await cls.run_io(len(content), cls.write_sync, path_str, content, limit=cls.io_inline_write_limit)
 
             except Exception as e:
                 Utils.base_logger.error(f"Error writing to file '{path_str}': {e}")
@@ -179,8 +532,7 @@ class Utils:
         @classmethod
         async def append_to_text_file(cls, path_str: str, content: str) -> int:
             try:
-                async with aiofiles.open(path_str, 'a') as file:
-                    return await file.write(content)
+                return await cls.run_io(len(content), cls.write_sync, path_str, content, 'a', limit=cls.io_inline_write_limit)
 
             except Exception as e:
                 Utils.base_logger.error(f"Error appending to file '{path_str}': {e}")
@@ -188,42 +540,29 @@ class Utils:
 
         @classmethod
         async def append_text_if_not_exists(cls, file_path: str, text_to_add: str):
-            async with aiofiles.open(file_path, 'r') as file:
-                file_content = await file.read()
+            written = await cls.run_io(cls.file_size(file_path), cls.append_text_sync, file_path, text_to_add, limit=cls.io_inline_write_limit)
 
-                if text_to_add not in file_content:
-                    async with aiofiles.open(file_path, 'a') as file_append:
-                        return await file_append.write("\n" + text_to_add)
-                else:
-                    Utils.base_logger.error(f"Text '{text_to_add}' already exists in the file.")
+            if written is None:
+                Utils.base_logger.error(f"Text '{text_to_add}' already exists in the file.")
+
+            return written
 
         @classmethod
         async def remove_text(cls, file_path: str, text_to_remove: str):
-            async with aiofiles.open(file_path, 'r') as file:
-                file_content = await file.read()
-
-            if text_to_remove in file_content:
-                file_content = file_content.replace(text_to_remove, '')
-
-                async with aiofiles.open(file_path, 'w') as file_write:
-                    await file_write.write(file_content)
-            else:
+            if not await cls.run_io(cls.file_size(file_path), cls.remove_text_sync, file_path, text_to_remove, limit=cls.io_inline_write_limit):
                 Utils.base_logger.warning(f"Text '{text_to_remove}' not found in the file: {file_path}")
 
-        @staticmethod
-        async def read_file(file_path):
+        @classmethod
+        async def read_file(cls, file_path):
             try:
-                async with aiofiles.open(file_path, mode='rb') as file:
-                    content = await file.read()
-                    return content
+                return await cls.run_io(cls.file_size(file_path), cls.read_sync, file_path, 'rb')
             except FileNotFoundError as ex:
                 Utils.base_logger.error(ex)
 
-        @staticmethod
-        async def save_content_to_file(content: str, file_path: str) -> bool:
+        @classmethod
+        async def save_content_to_file(cls, content: str, file_path: str) -> bool:
             try:
-                async with aiofiles.open(file_path, mode='wb') as file:
-                    await file.write(content)
+                await cls.run_io(len(content), cls.write_sync, file_path, content, 'wb', limit=cls.io_inline_write_limit)
                 return True
             except IOError as e:
                 Utils.base_logger.error(f"Error saving content to file: {e}")
@@ -248,17 +587,89 @@ class Utils:
                 return True
             return False
 
+        copy_chunk_size: int = 1024 * 1024
+
+        @classmethod
+        def kernel_copy(cls, source_fd: int, target_fd: int, size: int) -> int:
+            copied = 0
+
+            for method in ("copy_file_range", "sendfile"):
+                if not hasattr(os, method):
+                    continue
+
+                try:
+                    while copied < size:
+                        count = min(size - copied, 1 << 30)
+                        if method == "copy_file_range":
+                            sent = os.copy_file_range(source_fd, target_fd, count)
+                        else:
+                            sent = os.sendfile(target_fd, source_fd, None, count)
+
+                        if not sent:
+                            return copied
+                        copied += sent
+
+                    return copied
+
+                except OSError:
+                    continue
+
+            buffer = memoryview(bytearray(cls.copy_chunk_size))
+            while read := os.readv(source_fd, [buffer]):
+                written = 0
+                while written < read:
+                    written += os.write(target_fd, buffer[written:read])
+                copied += read
+
+            return copied
+
         @classmethod
-        def copy_file(cls, source_path: str, destination_path: str) -> None:
-            source = Path(source_path)
+        def copy_file(cls, source_path: str, destination_path: str) -> Path:
             destination = Path(destination_path)
-            destination.write_text(source.read_text())
+            if destination.is_dir():
+                destination = destination / Path(source_path).name
+
+            handle, temp_path = tempfile.mkstemp(prefix=f".{destination.name}.", suffix=".tmp", dir=destination.parent)
+
+            try:
+                with open(source_path, 'rb') as source, os.fdopen(handle, 'wb') as target:
+                    cls.kernel_copy(source.fileno(), target.fileno(), os.fstat(source.fileno()).st_size)
+
+                shutil.copystat(source_path, temp_path)
+                os.replace(temp_path, destination)
+
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+            return destination
 
         @classmethod
-        def move_file(cls, source_path: str, destination_path: str) -> None:
-            source = Path(source_path)
+        def move_file(cls, source_path: str, destination_path: str) -> Path:
             destination = Path(destination_path)
-            source.rename(destination)
+            if destination.is_dir():
+                destination = destination / Path(source_path).name
+
+            try:
+                os.replace(source_path, destination)
+
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+
+                cls.copy_file(source_path, destination)
+                os.remove(source_path)
+
+            return destination
+
+        @classmethod
+        async def copy_file_async(cls, source_path: str, destination_path: str) -> Path:
+            return await asyncio.to_thread(cls.copy_file, source_path, destination_path)
+
+        @classmethod
+        async def move_file_async(cls, source_path: str, destination_path: str) -> Path:
+            return await asyncio.to_thread(cls.move_file, source_path, destination_path)
 
         @classmethod
         def get_absolute_path(cls, path_str: str) -> Path:
@@ -356,39 +767,245 @@ class Utils:
         config: configparser.ConfigParser = configparser.ConfigParser()
         config_path = 'config.cfg'
         config.read(config_path)
-        api_id: str = config.get('client', 'api_id')
-        api_hash: str = config.get('client', 'api_hash')
-        api_token: str = config.get('client', 'api_token')
-        admin_id: str = config.get('client', 'admin_id')
-        admin_ids: list = [admin_id]
-        session_name: str = config.get('client', 'session_name')
-        inline_session_name: str = config.get('client', 'inline_session_name')
-        ipv6: bool = config.getboolean('args', 'ipv6')
-        request_retries: int = config.getint('args', 'request_retries')
-        retry_delay: int = config.getint('args', 'retry_delay')
-        auto_reconnect: bool = config.getboolean('args', 'auto_reconnect')
-        flood_sleep_threshold: int = config.getint('args', 'flood_sleep_threshold')
-        device_model: str | None = config.get('args', 'device_model')
-        system_version: str = config.get('args', 'system_version')
-        app_version: str = config.get('args', 'app_version')
-        lang_code: str = config.get('args', 'lang_code')
-        entity_cache_limit: int = config.getint('args', 'entity_cache_limit')
-
-        try:
-            auto_update: bool = config.getboolean('git', 'auto_update')
-            module_auto_update: bool = config.getboolean('git', 'module_auto_update')
-
-        except configparser.NoOptionError:
-            auto_update: bool = True
-            module_auto_update: bool = True
-
-        ModuleActions: bool = config.getboolean('logging', 'module')
-        LoaderActions: bool = config.getboolean('logging', 'loader')
-        ClientActions: bool = config.getboolean('logging', 'client')
-        UtilsActions: bool = config.getboolean('logging', 'utils')
+        api_id: str
+        api_hash: str
+        api_token: str
+        admin_id: str
+        admin_ids: list
+        accounts: dict
+        session_name: str
+        inline_session_name: str
+        ipv6: bool
+        request_retries: int
+        retry_delay: int
+        auto_reconnect: bool
+        flood_sleep_threshold: int
+        device_model: str | None
+        system_version: str
+        app_version: str
+        lang_code: str
+        entity_cache_limit: int
+        entity_store_size: int
+        entity_store_ttl: float
+        session_backend: str
+        session_flush_interval: float
+        transfer_workers: int
+        transfer_senders: int
+        auto_update: bool
+        module_auto_update: bool
+        ModuleActions: bool
+        LoaderActions: bool
+        ClientActions: bool
+        UtilsActions: bool
+        log_queue_size: int
+        log_queue_policy: str
+        log_rotate_bytes: int
+        log_rotate_interval: float
+        log_retention_count: int
+        log_retention_days: float
+        log_retention_bytes: int
+        log_rate_limit: int
+        metrics_file: str
+        metrics_interval: float
 
         modules_repo: str = 'https://raw.githubusercontent.com/reslaid/modules/main/Hayes-TL'
 
+        restart_keys: tuple = (
+            "api_id", "api_hash", "api_token", "session_name", "inline_session_name", "ipv6",
+            "device_model", "system_version", "app_version", "lang_code", "log_queue_size", "accounts",
+            "session_backend"
+        )
+        non_negative_keys: tuple = (
+            "request_retries", "retry_delay", "flood_sleep_threshold", "entity_cache_limit", "entity_store_size", "entity_store_ttl", "log_queue_size",
+            "log_rotate_bytes", "log_rotate_interval", "log_retention_count", "log_retention_days",
+            "log_retention_bytes", "log_rate_limit", "session_flush_interval", "transfer_workers", "transfer_senders",
+            "metrics_interval"
+        )
+        subscribers: list = []
+        watch_interval: float = 2.0
+        stamp: tuple | None = None
+
+        @staticmethod
+        def split_ids(value: str) -> list:
+            return [item.strip() for item in value.split(',') if item.strip()]
+
+        @classmethod
+        def read_values(cls, config: configparser.ConfigParser) -> dict:
+            values: dict = {
+                "api_id": config.get('client', 'api_id'),
+                "api_hash": config.get('client', 'api_hash'),
+                "api_token": config.get('client', 'api_token'),
+                "admin_id": config.get('client', 'admin_id'),
+                "session_name": config.get('client', 'session_name'),
+                "inline_session_name": config.get('client', 'inline_session_name'),
+                "ipv6": config.getboolean('args', 'ipv6'),
+                "request_retries": config.getint('args', 'request_retries'),
+                "retry_delay": config.getint('args', 'retry_delay'),
+                "auto_reconnect": config.getboolean('args', 'auto_reconnect'),
+                "flood_sleep_threshold": config.getint('args', 'flood_sleep_threshold'),
+                "device_model": config.get('args', 'device_model'),
+                "system_version": config.get('args', 'system_version'),
+                "app_version": config.get('args', 'app_version'),
+                "lang_code": config.get('args', 'lang_code'),
+                "entity_cache_limit": config.getint('args', 'entity_cache_limit'),
+                "entity_store_size": config.getint('args', 'entity_store_size', fallback=5000),
+                "entity_store_ttl": config.getfloat('args', 'entity_store_ttl', fallback=7 * 86400),
+                "session_backend": config.get('args', 'session_backend', fallback='wal'),
+                "session_flush_interval": config.getfloat('args', 'session_flush_interval', fallback=1.0),
+                "transfer_workers": config.getint('args', 'transfer_workers', fallback=4),
+                "transfer_senders": config.getint('args', 'transfer_senders', fallback=1),
+                "ModuleActions": config.getboolean('logging', 'module'),
+                "LoaderActions": config.getboolean('logging', 'loader'),
+                "ClientActions": config.getboolean('logging', 'client'),
+                "UtilsActions": config.getboolean('logging', 'utils'),
+                "log_queue_size": config.getint('logging', 'queue_size', fallback=10000),
+                "log_queue_policy": config.get('logging', 'queue_policy', fallback='drop'),
+                "log_rotate_bytes": config.getint('logging', 'rotate_bytes', fallback=10 * 1024 * 1024),
+                "log_rotate_interval": config.getfloat('logging', 'rotate_interval', fallback=0),
+                "log_retention_count": config.getint('logging', 'retention_count', fallback=10),
+                "log_retention_days": config.getfloat('logging', 'retention_days', fallback=30),
+                "log_retention_bytes": config.getint('logging', 'retention_bytes', fallback=100 * 1024 * 1024),
+                "log_rate_limit": config.getint('logging', 'rate_limit', fallback=0),
+                "metrics_file": config.get('logging', 'metrics_file', fallback='logs/metrics.prom'),
+                "metrics_interval": config.getfloat('logging', 'metrics_interval', fallback=15.0)
+            }
+            values["admin_ids"] = cls.split_ids(values["admin_id"])
+            values["accounts"] = {
+                section.split('.', 1)[1]: dict(config.items(section))
+                for section in config.sections()
+                if section.startswith('client.')
+            }
+
+            try:
+                values["auto_update"] = config.getboolean('git', 'auto_update')
+                values["module_auto_update"] = config.getboolean('git', 'module_auto_update')
+
+            except configparser.NoOptionError:
+                values["auto_update"] = True
+                values["module_auto_update"] = True
+
+            return values
+
+        @classmethod
+        def validate(cls, values: dict) -> dict:
+            if not values["admin_id"].strip():
+                raise ValueError("client.admin_id is empty")
+
+            if values["session_backend"] not in ("wal", "sqlite"):
+                raise ValueError(f"args.session_backend must be 'wal' or 'sqlite', got '{values['session_backend']}'")
+
+            if values["log_queue_policy"] not in ("drop", "block"):
+                raise ValueError(f"logging.queue_policy must be 'drop' or 'block', got '{values['log_queue_policy']}'")
+
+            for key in cls.non_negative_keys:
+                if values[key] < 0:
+                    raise ValueError(f"{key} must not be negative, got {values[key]}")
+
+            return values
+
+        @classmethod
+        def load(cls, config_path: str) -> tuple:
+            config = configparser.ConfigParser()
+            with open(config_path, 'r') as config_file:
+                config.read_file(config_file)
+
+            return config, cls.validate(cls.read_values(config))
+
+        @classmethod
+        def apply(cls, values: dict) -> dict:
+            changes: dict = {
+                key: (getattr(cls, key, None), value)
+                for key, value in values.items()
+                if getattr(cls, key, None) != value
+            }
+
+            for key, value in values.items():
+                setattr(cls, key, value)
+
+            return changes
+
+        @classmethod
+        def configure_logging(cls) -> None:
+            Moon.writer.configure(maxsize=cls.log_queue_size, policy=cls.log_queue_policy)
+            Moon.rate_limit = cls.log_rate_limit
+            Moon.configure_rotation(
+                max_bytes=cls.log_rotate_bytes,
+                interval=cls.log_rotate_interval,
+                count=cls.log_retention_count,
+                age=cls.log_retention_days * 86400,
+                total_bytes=cls.log_retention_bytes
+            )
+
+        @classmethod
+        def subscribe(cls, callback) -> None:
+            if callback not in cls.subscribers:
+                cls.subscribers.append(callback)
+
+        @classmethod
+        def unsubscribe(cls, callback) -> None:
+            if callback in cls.subscribers:
+                cls.subscribers.remove(callback)
+
+        @classmethod
+        def publish(cls, changes: dict) -> None:
+            for callback in list(cls.subscribers):
+                try:
+                    callback(changes)
+                except Exception as e:
+                    Utils.base_logger.error("Config subscriber %r failed: %s", callback, e)
+
+        @classmethod
+        def file_stamp(cls) -> tuple | None:
+            try:
+                stat = os.stat(cls.config_path)
+                return stat.st_mtime_ns, stat.st_size
+            except OSError:
+                return None
+
+        @classmethod
+        async def reload(cls) -> dict:
+            started = time.perf_counter()
+
+            try:
+                config, values = await asyncio.to_thread(cls.load, cls.config_path)
+
+            except (OSError, ValueError, configparser.Error) as e:
+                Utils.base_logger.error("Config reload rejected, keeping the current values: %s", e)
+                return {}
+
+            cls.config = config
+            changes = cls.apply(values)
+
+            if changes:
+                restart = [key for key in changes if key in cls.restart_keys]
+                if restart:
+                    Utils.base_logger.warning("Config keys %s change only after a restart", restart)
+
+                cls.publish(changes)
+
+            Utils.base_logger.info("Config reloaded in %.1f ms: %s", (time.perf_counter() - started) * 1000, sorted(changes))
+            return changes
+
+        @classmethod
+        async def watch(cls, interval: float | None = None) -> None:
+            cls.stamp = cls.stamp or cls.file_stamp()
+
+            while True:
+                await asyncio.sleep(interval or cls.watch_interval)
+                stamp = cls.file_stamp()
+
+                if stamp is not None and stamp != cls.stamp:
+                    cls.stamp = stamp
+                    await cls.reload()
+
+        @staticmethod
+        def apply_logging(changes: dict) -> None:
+            if any(key.startswith("log_") for key in changes):
+                Utils.Config.configure_logging()
+
+            if "UtilsActions" in changes:
+                Utils.base_logger.base_logger().disabled = not Utils.Config.UtilsActions
+
         def getval(section: str, value: str) -> str:
             return Utils.Config.config.get(section, value)
 
@@ -415,6 +1032,10 @@ class Utils:
         def show(text, font: str = 'slant'):
             print(Utils.Banner.get(text, font=font))
 
+    Config.apply(Config.read_values(Config.config))
+    Config.configure_logging()
+    Config.subscribe(Config.apply_logging)
+
     base_logger: Moon = Moon(
         name='Utils',
         log_file=Files.log_path('hayes.log'),